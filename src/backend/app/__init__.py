@@ -1,32 +1,58 @@
+import os
+from collections.abc import Mapping
 from flask import Flask
-from .config import Config
-from .extensions import db, cors
+from .config import CONFIGS
+from .extensions import db, cors, report_cache, events
+from .serialization import JSONProvider
+from .metrics import metrics
+from .write_queue import write_queue
+from .routing import read_router
+from .archive import archive
+from . import sqlite
+# Creates and drops the full-text index together with the tables
+from . import search
 
-def create_app(config_class=Config):
+def create_app(config_class=None):
+    if config_class is None:
+        config_class = CONFIGS[os.getenv("APP_CONFIG", "default")]
     app = Flask(__name__)
-    app.config.from_object(config_class)
+    if isinstance(config_class, Mapping):
+        # Another app's settings, as handed to the report worker processes
+        app.config.from_mapping(config_class)
+    else:
+        app.config.from_object(config_class)
+    app.json = JSONProvider(app)
 
     # init extension
+    read_router.configure(app)
     db.init_app(app)
     cors.init_app(app)
+    report_cache.init_app(app)
+    events.init_app(app)
+    sqlite.init_app(app)
+    metrics.init_app(app)
+    write_queue.init_app(app)
+    read_router.init_app(app)
+    archive.init_app(app)
 
     # register blueprints
     from .routes.child import child_bp
-    from .routes.sleep import sleep_bp
-    from .routes.feed import feed_bp
-    from .routes.nappy_change import nappy_bp
-    from .routes.medication import medication_bp
-    from .routes.temperature import temperature_bp
-    from .routes.growth import growth_bp
+    from .routes.record_resource import record_blueprint
     from .routes.report_routes import report_bp
+    from .routes.records import records_bp
+    from .routes.growth import growth_bp
+    from .routes.series import series_bp
+    from .routes.search import search_bp
+    from .records import RECORD_TYPES
 
     app.register_blueprint(child_bp)
-    app.register_blueprint(sleep_bp)
-    app.register_blueprint(feed_bp)
-    app.register_blueprint(nappy_bp)
-    app.register_blueprint(medication_bp)
-    app.register_blueprint(temperature_bp)
+    # sleep, feed, nappy, medication, temperature and growth share one set of routes
+    for record_type in RECORD_TYPES.values():
+        app.register_blueprint(record_blueprint(record_type))
+    app.register_blueprint(records_bp)
     app.register_blueprint(growth_bp)
+    app.register_blueprint(series_bp)
+    app.register_blueprint(search_bp)
     #Register blueprint with API prefix
     app.register_blueprint(report_bp, url_prefix='/api')
 
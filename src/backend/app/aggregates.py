@@ -0,0 +1,53 @@
+from sqlalchemy import Integer, case, cast, distinct, func, select
+from .extensions import db
+from .records import RECORD_TYPES, select_records
+
+BUCKETS = ["day", "week", "month"]
+
+
+def sleep_minutes(sleeps):
+    """Duration of a sleep record in minutes, computed by SQLite; overnight sleeps wrap past midnight.
+
+    sleeps holds the sleep columns: the model's, or those of a select_records subquery.
+    """
+    minutes = (func.julianday(sleeps.end_time) - func.julianday(sleeps.start_time)) * 1440
+    minutes = case((sleeps.end_time < sleeps.start_time, minutes + 1440), else_=minutes)
+    return cast(func.round(minutes), Integer)
+
+
+def bucket_start(bucket, sleeps):
+    """First day of the bucket a sleep record falls in; weeks start on Monday"""
+    if bucket == "day":
+        return sleeps.sleep_date
+    if bucket == "week":
+        return func.date(sleeps.sleep_date, "weekday 0", "-6 days", type_=db.Date)
+    return func.strftime("%Y-%m-01", sleeps.sleep_date, type_=db.Date)
+
+
+def sleep_stats(child_id, date_from, date_to, bucket=None):
+    """Sleep totals and averages for a date window, per bucket or for the whole window.
+
+    Everything is aggregated by the database, so the cost depends on the number of
+    buckets returned rather than the number of sleep records in the window.
+    """
+    # Hot and, for windows reaching back past the archive cutoff, archived sleeps
+    sleeps = select_records(RECORD_TYPES["sleep"], child_id, date_from, date_to).subquery().c
+    total_minutes = func.coalesce(func.sum(sleep_minutes(sleeps)), 0)
+    naps = func.coalesce(func.sum(case((sleeps.sleep_type == "Day time nap", 1), else_=0)), 0)
+    days = func.count(distinct(sleeps.sleep_date))
+    # Days without any sleep record don't count; an empty window averages over one day
+    days_divisor = func.max(days, 1)
+
+    columns = [
+        total_minutes.label("total_sleep_minutes"),
+        func.round(naps * 1.0 / days_divisor, 1).label("avg_naps_per_day"),
+        func.round(total_minutes / 60.0 / days_divisor, 1).label("avg_sleep_hours"),
+        days.label("days_with_records"),
+    ]
+    query = select(*columns)
+    if bucket is None:
+        return dict(db.session.execute(query).one()._mapping)
+
+    start = bucket_start(bucket, sleeps).label("bucket")
+    query = query.add_columns(start).group_by(start).order_by(start)
+    return [dict(row._mapping) for row in db.session.execute(query)]
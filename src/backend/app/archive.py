@@ -0,0 +1,132 @@
+"""Cold storage for old records in a separate SQLite file.
+
+With ARCHIVE_DATABASE set, the file is ATTACHed as "archive" to every connection, so
+queries can UNION ALL the hot tables with their archive counterparts in one statement.
+Archive tables keep only the exposed columns and are WITHOUT ROWID tables clustered on
+(child_id, id), so one child's history is stored contiguously and compactly.
+`flask archive` moves records older than ARCHIVE_AFTER_DAYS there and records the
+cutoff, so date-filtered reads only touch the archive when their range reaches back.
+"""
+import os
+from sqlalchemy import Column, Date, Integer, MetaData, Table, delete, event, insert, select, text, update
+from .extensions import db
+
+SCHEMA = "archive"
+
+
+class Archive:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.metadata = MetaData(schema=SCHEMA)
+        # Cutoff of the archived records: everything dated before it may be in the archive
+        self.state = Table("archive_state", self.metadata,
+                           Column("id", Integer, primary_key=True),
+                           Column("archived_before", Date, nullable=False))
+        self._tables = {}
+
+    def init_app(self, app):
+        path = app.config.get("ARCHIVE_DATABASE")
+        self.enabled = bool(path)
+        if not path:
+            return
+        # Relative paths live in the instance folder, like the main database
+        self.path = path if os.path.isabs(path) else os.path.join(app.instance_path, path)
+        app.extensions["archive"] = self
+
+        def attacher(target):
+            def attach(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f"ATTACH DATABASE ? AS {SCHEMA}", (target,))
+                cursor.close()
+            return attach
+
+        from .records import RECORD_TYPES
+        for record_type in RECORD_TYPES.values():
+            self.table(record_type)
+        with app.app_context():
+            for engine in db.engines.values():
+                if engine.dialect.name != "sqlite":
+                    continue
+                # The read-only pool of the read/write split attaches the archive read-only too
+                read_only = engine.url.query.get("mode") == "ro"
+                event.listen(engine, "connect", attacher(f"file:{self.path}?mode=ro" if read_only else self.path))
+            self.metadata.create_all(db.engine)
+
+    def table(self, record_type):
+        """The archive table of a record type: id, child_id and the exposed fields"""
+        table = self._tables.get(record_type.name)
+        if table is None:
+            source = record_type.model.__table__
+            table = self._tables[record_type.name] = Table(
+                source.name, self.metadata,
+                Column("child_id", Integer, primary_key=True, autoincrement=False),
+                Column("id", Integer, primary_key=True, autoincrement=False),
+                *[Column(field, source.c[field].type, nullable=source.c[field].nullable)
+                  for field in record_type.fields],
+                sqlite_with_rowid=False,
+            )
+        return table
+
+    def archived_before(self):
+        """Cutoff of the last archival run, or None if nothing was ever archived"""
+        return db.session.scalar(select(self.state.c.archived_before).where(self.state.c.id == 1))
+
+    def covers(self, date_from):
+        """Whether reads from date_from (None: all history) have to include the archive"""
+        if not self.enabled:
+            return False
+        cutoff = self.archived_before()
+        return cutoff is not None and (date_from is None or date_from < cutoff)
+
+    def archive_records(self, before, echo=print):
+        """Move records dated before `before` from the hot tables into the archive, one type per transaction"""
+        from .records import RECORD_TYPES
+        from .search import SEARCHABLE, index_missing
+        for record_type in RECORD_TYPES.values():
+            model = record_type.model
+            table = self.table(record_type)
+            columns = ["child_id", "id"] + record_type.fields
+            # The record tables use AUTOINCREMENT, so the ids of moved rows are never handed out again
+            selected = (model.__table__.c[record_type.date_field] < before,)
+            moved = db.session.execute(
+                insert(table).from_select(columns, select(*[model.__table__.c[c] for c in columns]).where(*selected))
+                .prefix_with("OR REPLACE")
+            ).rowcount
+            db.session.execute(delete(model).where(*selected).execution_options(synchronize_session=False))
+            # The delete triggers took the moved rows out of the search index; they stay searchable
+            if record_type.name in SEARCHABLE:
+                index_missing(record_type.name, table)
+            self.advance_cutoff(before)
+            db.session.commit()
+            echo(f"{record_type.label}: {moved} records archived")
+
+    def reserve_ids(self):
+        """Raise each record table's AUTOINCREMENT counter past its archived ids.
+
+        Tables rebuilt by `flask migrate` start counting at their highest hot id, which an
+        archive written before AUTOINCREMENT may already exceed.
+        """
+        from .records import RECORD_TYPES
+        for record_type in RECORD_TYPES.values():
+            name = record_type.model.__tablename__
+            archived = db.session.scalar(select(db.func.max(self.table(record_type).c.id)))
+            if archived is None:
+                continue
+            params = {"name": name, "seq": archived}
+            counter = db.session.scalar(text("SELECT seq FROM sqlite_sequence WHERE name = :name"), params)
+            if counter is None:
+                db.session.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"), params)
+            elif counter < archived:
+                db.session.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = :name"), params)
+        db.session.commit()
+
+    def advance_cutoff(self, before):
+        cutoff = self.archived_before()
+        if cutoff is None:
+            db.session.execute(insert(self.state).values(id=1, archived_before=before))
+        elif before > cutoff:
+            db.session.execute(update(self.state).where(self.state.c.id == 1).values(archived_before=before))
+
+
+archive = Archive()
@@ -0,0 +1,86 @@
+from sqlalchemy import event, insert, select, update
+from .extensions import db, events, report_cache
+from .models import Child, ChangeCounter, Tombstone
+
+
+def mark_changed(child_id):
+    """Note that the current transaction changes a child's data, which makes its cached reports stale"""
+    db.session.info.setdefault("changed_children", set()).add(child_id)
+
+
+def change_version():
+    """The change version of the current transaction, allocated on first use.
+
+    Bumping the counter row locks it until commit, so writers get versions in commit
+    order and a client that synced up to version N never misses a later commit
+    with a smaller version.
+    """
+    version = db.session.info.get("change_version")
+    if version is None:
+        version = db.session.scalar(
+            update(ChangeCounter).where(ChangeCounter.id == 1)
+            .values(version=ChangeCounter.version + 1)
+            .returning(ChangeCounter.version)
+            .execution_options(synchronize_session=False)
+        )
+        if version is None:
+            version = 1
+            db.session.execute(insert(ChangeCounter).values(id=1, version=version))
+        db.session.info["change_version"] = version
+    return version
+
+
+def latest_version():
+    """Highest committed change version, the sync token for a client that has everything"""
+    return db.session.scalar(select(ChangeCounter.version).where(ChangeCounter.id == 1)) or 0
+
+
+def pending_event(child_id):
+    """The /events payload of a child collected by the current transaction, shaped like a /changes result"""
+    pending = db.session.info.setdefault("pending_events", {})
+    payload = pending.get(child_id)
+    if payload is None:
+        payload = pending[child_id] = {"changed": {}, "deleted": {}}
+    return payload
+
+
+def records_created(record_type, child_id, records):
+    """Announce new records (dicts shaped like list results) to the child's subscribers once committed"""
+    pending_event(child_id)["changed"].setdefault(record_type.name, []).extend(records)
+
+
+def record_deleted(record_type, child_id, record_id):
+    """Leave a tombstone so delta sync tells clients to drop the record, and announce the delete"""
+    db.session.execute(insert(Tombstone).values(
+        child_id=child_id, record_type=record_type.name, record_id=record_id, version=change_version()
+    ))
+    pending_event(child_id)["deleted"].setdefault(record_type.name, []).append(record_id)
+
+
+@event.listens_for(db.session, "before_commit")
+def stamp_changed(session):
+    """Record the transaction's change version on the children it changed, for other workers' caches"""
+    changed = session.info.get("changed_children")
+    if changed:
+        session.execute(
+            update(Child).where(Child.id.in_(changed)).values(data_version=change_version())
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(db.session, "after_commit")
+def invalidate_changed(session):
+    version = session.info.pop("change_version", None)
+    changed = session.info.pop("changed_children", ())
+    for child_id in changed:
+        report_cache.invalidate_child(child_id)
+    # One event per child and transaction, so a resumed stream never sees half a commit
+    for child_id, payload in session.info.pop("pending_events", {}).items():
+        events.publish(child_id, version, {"version": version, **payload})
+
+
+@event.listens_for(db.session, "after_rollback")
+def forget_changed(session):
+    session.info.pop("change_version", None)
+    session.info.pop("changed_children", None)
+    session.info.pop("pending_events", None)
@@ -1,9 +1,112 @@
+from datetime import date, timedelta
 import click
 from .extensions import db
+from .migrations import MigrationError, needs_rebuild, run_migrations
+from .summary import rebuild_summaries
+from .search import rebuild_index
+from .export import FORMATS, export_child
+from .seed import seed_database
+from .records import RECORD_TYPES, purge_children
+from .report_jobs import OUTPUTS, generate_reports
+from .archive import archive
 
 def register_commands(app):
     @app.cli.command("create")
     def create_db():
         db.drop_all()
         db.create_all()
-        click.echo("Database created!")
\ No newline at end of file
+        if archive.enabled:
+            archive.metadata.drop_all(db.engine)
+            archive.metadata.create_all(db.engine)
+        click.echo("Database created!")
+
+    @app.cli.command("migrate")
+    @click.option("--chunk-size", default=1000, show_default=True, help="Rows converted per transaction")
+    def migrate_db(chunk_size):
+        """Bring an existing database up to date without dropping any data"""
+        try:
+            run_migrations(echo=click.echo, chunk_size=chunk_size)
+        except MigrationError as e:
+            raise click.ClickException(str(e))
+        click.echo("Database migrated!")
+
+    @app.cli.command("rebuild-summaries")
+    @click.option("--child-id", type=int, help="Only rebuild this child's summary")
+    def rebuild_summaries_command(child_id):
+        """Recompute the daily summary table from the record tables"""
+        rebuild_summaries(child_id=child_id, echo=click.echo)
+        click.echo("Daily summaries rebuilt!")
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index_command():
+        """Recompute the full-text search index from the record tables and the archive"""
+        rebuild_index(echo=click.echo)
+        click.echo("Search index rebuilt!")
+
+    @app.cli.command("purge")
+    @click.argument("child_ids", type=int, nargs=-1, required=True)
+    def purge_command(child_ids):
+        """Delete children and all of their records"""
+        deleted = purge_children(child_ids)
+        db.session.commit()
+        missing = sorted(set(child_ids) - set(deleted))
+        click.echo(f"Deleted {len(deleted)} children")
+        if missing:
+            click.echo(f"Not found: {', '.join(map(str, missing))}")
+
+    @app.cli.command("archive")
+    @click.option("--days", type=int, help="Archive records older than this many days (default: ARCHIVE_AFTER_DAYS)")
+    def archive_command(days):
+        """Move old records out of the hot tables into the archive database"""
+        if not archive.enabled:
+            raise click.ClickException("Set ARCHIVE_DATABASE to enable the archive")
+        # Without AUTOINCREMENT the hot tables could hand out archived ids again
+        if any(needs_rebuild(record_type.model.__table__) for record_type in RECORD_TYPES.values()):
+            raise click.ClickException("Run flask migrate before archiving")
+        days = app.config["ARCHIVE_AFTER_DAYS"] if days is None else days
+        before = date.today() - timedelta(days=days)
+        archive.archive_records(before, echo=click.echo)
+        click.echo(f"Records dated before {before} archived!")
+
+    @app.cli.group("reports")
+    def reports_group():
+        """Pre-render daily reports"""
+
+    @reports_group.command("generate")
+    @click.option("--date", "report_date", type=click.DateTime(formats=["%Y-%m-%d"]), required=True)
+    @click.option("--output", type=click.Choice(OUTPUTS), default="table", show_default=True,
+                  help="Store reports in the generated_report table or in NDJSON files")
+    @click.option("--directory", default="reports", show_default=True, help="Where NDJSON files are written")
+    @click.option("--workers", type=int, help="Worker processes (default: one per CPU)")
+    @click.option("--shard-size", default=100, show_default=True, help="Children per shard")
+    def generate_reports_command(report_date, output, directory, workers, shard_size):
+        """Render every child's daily report for a date across a pool of processes"""
+        written, elapsed = generate_reports(
+            report_date.date(), output=output, directory=directory, workers=workers,
+            shard_size=shard_size, echo=click.echo
+        )
+        click.echo(f"Generated {written} reports in {elapsed:.1f}s ({written / elapsed:.0f}/s)")
+
+    @app.cli.command("export")
+    @click.argument("child_id", type=int)
+    @click.option("--format", "export_format", type=click.Choice(list(FORMATS)), default="ndjson", show_default=True)
+    @click.option("--output", type=click.File("w"), default="-", help="File to write to (default: stdout)")
+    def export_command(child_id, export_format, output):
+        """Write a child's full record history as NDJSON or CSV"""
+        for chunk in export_child(child_id, export_format):
+            output.write(chunk)
+
+    @app.cli.command("seed")
+    @click.option("--children", default=10, show_default=True, help="Number of children to add")
+    @click.option("--days", default=730, show_default=True, help="Days of history per child")
+    @click.option("--seed", default=0, show_default=True, help="Random seed, for repeatable data")
+    @click.option("--feeds-per-day", default=7, show_default=True)
+    @click.option("--nappies-per-day", default=6, show_default=True)
+    @click.option("--naps-per-day", default=2, show_default=True)
+    def seed_command(children, days, seed, feeds_per_day, nappies_per_day, naps_per_day):
+        """Add children with realistic synthetic histories across all record types"""
+        seed_database(
+            children=children, days=days, seed=seed, feeds_per_day=feeds_per_day,
+            nappies_per_day=nappies_per_day, naps_per_day=naps_per_day, echo=click.echo
+        )
+        click.echo("Database seeded!")
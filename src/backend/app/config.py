@@ -3,4 +3,65 @@ import os
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///children.sqlite")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-key-123")
\ No newline at end of file
+    SECRET_KEY = os.getenv("SECRET_KEY", "dev-key-123")
+    # Upper bound for the limit parameter of the record list endpoints
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 500))
+    # Largest batch accepted by the bulk ingest endpoints
+    MAX_BULK_SIZE = int(os.getenv("MAX_BULK_SIZE", 5000))
+    # Rendered daily reports kept in memory per worker, and for how many seconds
+    REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", 1024))
+    REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", 300))
+    # Most children one /api/daily-report request may ask for
+    MAX_REPORT_CHILDREN = int(os.getenv("MAX_REPORT_CHILDREN", 100))
+    # PRAGMA statements run on every new SQLite connection, in order.
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless they are switched on.
+    SQLITE_PRAGMAS = {"foreign_keys": "ON"}
+    # Per-endpoint latency and SQL metrics at /metrics, plus a Server-Timing header
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    # Record change events kept in memory per child for /events subscribers that fall behind,
+    # and seconds between heartbeats on an idle stream, which is also how often a stream
+    # checks the database for commits made by other worker processes
+    EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 100))
+    EVENTS_HEARTBEAT = int(os.getenv("EVENTS_HEARTBEAT", 15))
+    # Group commit: single record creates are queued and committed together by one writer
+    # thread, every GROUP_COMMIT_DELAY_MS or GROUP_COMMIT_MAX_ROWS rows. A full queue answers 503.
+    GROUP_COMMIT_ENABLED = os.getenv("GROUP_COMMIT_ENABLED", "0") == "1"
+    GROUP_COMMIT_QUEUE_SIZE = int(os.getenv("GROUP_COMMIT_QUEUE_SIZE", 1024))
+    GROUP_COMMIT_MAX_ROWS = int(os.getenv("GROUP_COMMIT_MAX_ROWS", 256))
+    GROUP_COMMIT_DELAY_MS = float(os.getenv("GROUP_COMMIT_DELAY_MS", 2))
+    # Seconds a request waits for its row to be committed
+    GROUP_COMMIT_TIMEOUT = float(os.getenv("GROUP_COMMIT_TIMEOUT", 10))
+    # Engine for the SELECTs of GET requests: a replica's URL, or "readonly" for a read-only
+    # (mode=ro) pool on the SQLite file. Unset, everything uses the primary.
+    READ_REPLICA_URL = os.getenv("READ_REPLICA_URL")
+    # Seconds after a write during which the writing client's reads stay on the primary
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    # SQLite file (relative to the instance folder) that `flask archive` moves old records
+    # into, and the age in days after which a record counts as old. Unset, nothing is archived.
+    ARCHIVE_DATABASE = os.getenv("ARCHIVE_DATABASE")
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+
+class ProductionConfig(Config):
+    # WAL lets readers run alongside the single writer; NORMAL only fsyncs at checkpoints,
+    # which is still crash-safe in WAL mode. Writers wait for the lock instead of failing.
+    SQLITE_PRAGMAS = {
+        "foreign_keys": "ON",
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)),
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_recycle": 3600,
+        "connect_args": {"check_same_thread": False},
+    }
+
+# Profiles selectable through the APP_CONFIG environment variable
+CONFIGS = {
+    "default": Config,
+    "production": ProductionConfig,
+}
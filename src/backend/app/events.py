@@ -0,0 +1,143 @@
+"""Server-Sent Events of committed record changes, per child.
+
+Streams are plain blocking generators: every open stream holds one server thread for as
+long as the client stays connected, idle or not (it holds no database connection while
+it waits). The number of subscribers a worker can serve is the size of its thread pool.
+"""
+import json
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class EventBroker:
+    """In-process publish/subscribe of committed record changes, per child.
+
+    Each child keeps a short buffer of recent events so a subscriber that was busy
+    sending can catch up. Subscribers wait on a per-child condition, so a publish only
+    wakes the streams of that child. Events are ordered by change version.
+
+    A child's buffer and condition only exist while it has subscribers. A client that
+    connects later, or reconnects, catches up from the database before it waits, so
+    events published while nobody listened are not needed.
+    """
+
+    def __init__(self, buffer_size=100):
+        self.buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._buffers = {}
+        self._conditions = {}
+        # Highest version dropped from each child's buffer; older cursors must re-sync
+        self._evicted = {}
+
+    def init_app(self, app):
+        self.buffer_size = app.config["EVENTS_BUFFER_SIZE"]
+        app.extensions["events"] = self
+
+    def _condition(self, child_id):
+        condition = self._conditions.get(child_id)
+        if condition is None:
+            condition = self._conditions[child_id] = threading.Condition(self._lock)
+        return condition
+
+    @contextmanager
+    def subscribe(self, child_id):
+        """Buffer the child's events while the caller streams them; enter before reading the database"""
+        with self._lock:
+            self._subscribers[child_id] = self._subscribers.get(child_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._subscribers[child_id] -= 1
+                if not self._subscribers[child_id]:
+                    for state in (self._subscribers, self._buffers, self._conditions, self._evicted):
+                        state.pop(child_id, None)
+
+    def publish(self, child_id, version, payload):
+        with self._lock:
+            if child_id not in self._subscribers:
+                return
+            buffer = self._buffers.get(child_id)
+            if buffer is None:
+                buffer = self._buffers[child_id] = deque()
+            buffer.append((version, payload))
+            while len(buffer) > self.buffer_size:
+                self._evicted[child_id] = buffer.popleft()[0]
+            self._condition(child_id).notify_all()
+
+    def wait(self, child_id, after, timeout):
+        """Events of a child newer than `after`, waiting up to `timeout` seconds for one.
+
+        Returns None when events newer than `after` were already dropped from the
+        buffer; the caller then has to catch up from the database.
+        """
+        with self._lock:
+            condition = self._condition(child_id)
+            for attempt in range(2):
+                if self._evicted.get(child_id, 0) > after:
+                    return None
+                events = [event for event in self._buffers.get(child_id, ()) if event[0] > after]
+                if events or attempt:
+                    return events
+                condition.wait(timeout)
+
+
+def has_changes(result):
+    return any(result["changed"].values()) or any(result["deleted"].values())
+
+
+def server_sent_event(event, version, data):
+    from .serialization import format_value
+
+    payload = json.dumps(data, default=format_value, separators=(",", ":"))
+    return f"event: {event}\nid: {version}\ndata: {payload}\n\n"
+
+
+def change_events(child_id, since, heartbeat):
+    """Server-Sent Events of a child's committed changes, each shaped like a /changes result.
+
+    With a sync token (the Last-Event-ID of a reconnecting client) the missed changes are
+    read from the database first; after that every commit of this process arrives from the
+    in-process broker, with its change version as the event id. A subscriber that falls
+    behind the broker's buffer catches up from the database the same way, and so does an
+    idle stream at every heartbeat when the change counter moved past it, which brings in
+    the writes of other worker processes. The connection is returned to the pool before
+    waiting, so idle streams hold no database resources (the waiting thread remains).
+    """
+    # Imported here: the extensions module creates the broker from this one
+    from .changes import latest_version
+    from .extensions import db, events
+    from .records import changes_since
+
+    # Browsers reconnect after this many milliseconds, sending the last event id they saw
+    yield "retry: 3000\n\n"
+    with events.subscribe(child_id):
+        if since is None:
+            cursor = latest_version()
+        else:
+            result = changes_since(child_id, since)
+            cursor = result["version"]
+            if has_changes(result):
+                yield server_sent_event("changes", cursor, result)
+        db.session.close()
+        yield server_sent_event("ready", cursor, {"version": cursor})
+
+        while True:
+            pending = events.wait(child_id, cursor, heartbeat)
+            if not pending:
+                # Behind the buffer, or idle: other workers' commits only show in the database
+                behind = pending is None or latest_version() > cursor
+                if behind:
+                    result = changes_since(child_id, cursor)
+                    cursor = result["version"]
+                db.session.close()
+                if behind and has_changes(result):
+                    yield server_sent_event("changes", cursor, result)
+                elif pending is not None:
+                    # A comment line keeps proxies from closing the idle connection and reveals gone clients
+                    yield ": heartbeat\n\n"
+            for version, payload in pending or ():
+                cursor = version
+                yield server_sent_event("changes", version, payload)
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from .extensions import db
+from .records import RECORD_TYPES, order_by_keys, select_records
+from .serialization import format_value
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# One CSV layout for every record type; fields a type doesn't have stay empty
+CSV_COLUMNS = ["type", "id", "child_id"] + list(dict.fromkeys(
+    field for record_type in RECORD_TYPES.values() for field in record_type.fields
+))
+
+CHUNK_SIZE = 1000
+
+
+def export_rows(child_id):
+    """Yield (type name, row chunk) pairs for a child's full history, one server-side cursor per type"""
+    for name, record_type in RECORD_TYPES.items():
+        # The whole history, archived records included
+        query = order_by_keys(select_records(record_type, child_id), record_type).execution_options(
+            yield_per=CHUNK_SIZE
+        )
+        for partition in db.session.execute(query).partitions():
+            yield name, partition
+
+
+def export_ndjson(child_id):
+    for name, rows in export_rows(child_id):
+        yield "".join(
+            json.dumps({"type": name, **row._mapping}, default=format_value, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def export_csv(child_id):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    for name, rows in export_rows(child_id):
+        writer.writerows(
+            {key: format_value(value) for key, value in {"type": name, **row._mapping}.items()}
+            for row in rows
+        )
+        # Hand each chunk out and reuse the buffer, so memory doesn't grow with history
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_child(child_id, export_format):
+    """Generator of text chunks making up the export of one child in the given format"""
+    if export_format == "csv":
+        return export_csv(child_id)
+    return export_ndjson(child_id)
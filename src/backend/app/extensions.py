@@ -1,5 +1,11 @@
-from flask_sqlalchemy import SQLAlchemy
-from flask_cors import CORS
-
-db = SQLAlchemy()
-cors = CORS()
+from flask_sqlalchemy import SQLAlchemy
+from flask_cors import CORS
+from .cache import ResponseCache
+from .events import EventBroker
+from .routing import LAST_WRITE_HEADER, RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+# The frontend runs on another origin and has to read the write time to send it back
+cors = CORS(expose_headers=[LAST_WRITE_HEADER])
+report_cache = ResponseCache()
+events = EventBroker()
@@ -0,0 +1,137 @@
+"""Per-endpoint request metrics exposed in the Prometheus text format.
+
+Each worker process keeps its own counters; Prometheus sums them across scrape targets.
+"""
+import bisect
+import threading
+import time
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from .extensions import db, report_cache
+
+# Prometheus' default latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.sum}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class Metrics:
+    """Request latency, SQL statement and response size metrics for every endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.latency = {}
+        self.sizes = {}
+        self.sql_statements = {}
+        self.sql_seconds = {}
+
+    def init_app(self, app):
+        if not app.config["METRICS_ENABLED"]:
+            return
+        app.extensions["metrics"] = self
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.add_url_rule("/metrics", "metrics", self.render)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", self.after_cursor_execute)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if has_request_context() and conn.info.get("query_start"):
+            g.sql_count = g.get("sql_count", 0) + 1
+            g.sql_seconds = g.get("sql_seconds", 0.0) + time.perf_counter() - conn.info["query_start"].pop()
+
+    def start_request(self):
+        g.request_start = time.perf_counter()
+
+    def finish_request(self, response):
+        if "request_start" not in g:
+            return response
+        elapsed = time.perf_counter() - g.request_start
+        sql_count = g.get("sql_count", 0)
+        sql_seconds = g.get("sql_seconds", 0.0)
+        # Group by route pattern, not by URL, so ids don't explode the label set
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        key = (endpoint, request.method)
+
+        with self._lock:
+            status_key = key + (response.status_code,)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.sql_statements[key] = self.sql_statements.get(key, 0) + sql_count
+            self.sql_seconds[key] = self.sql_seconds.get(key, 0.0) + sql_seconds
+            # Streamed responses have no length up front and are left out
+            if response.content_length is not None:
+                self.sizes.setdefault(key, Histogram(SIZE_BUCKETS)).observe(response.content_length)
+
+        response.headers["Server-Timing"] = (
+            f'app;dur={elapsed * 1000:.2f}, db;dur={sql_seconds * 1000:.2f};desc="{sql_count} queries"'
+        )
+        return response
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += ["# HELP http_requests_total Requests handled, by endpoint, method and status",
+                      "# TYPE http_requests_total counter"]
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            lines += ["# HELP http_request_duration_seconds Time spent handling requests",
+                      "# TYPE http_request_duration_seconds histogram"]
+            for (endpoint, method), histogram in sorted(self.latency.items()):
+                lines += histogram.lines("http_request_duration_seconds", f'endpoint="{endpoint}",method="{method}"')
+
+            lines += ["# HELP http_response_size_bytes Size of non-streamed response bodies",
+                      "# TYPE http_response_size_bytes histogram"]
+            for (endpoint, method), histogram in sorted(self.sizes.items()):
+                lines += histogram.lines("http_response_size_bytes", f'endpoint="{endpoint}",method="{method}"')
+
+            lines += ["# HELP db_statements_total SQL statements executed while handling requests",
+                      "# TYPE db_statements_total counter"]
+            for (endpoint, method), count in sorted(self.sql_statements.items()):
+                lines.append(f'db_statements_total{{endpoint="{endpoint}",method="{method}"}} {count}')
+
+            lines += ["# HELP db_statement_seconds_total Time spent in SQL statements while handling requests",
+                      "# TYPE db_statement_seconds_total counter"]
+            for (endpoint, method), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'db_statement_seconds_total{{endpoint="{endpoint}",method="{method}"}} {seconds}')
+
+        cache = report_cache.stats()
+        lines += ["# HELP report_cache_hits_total Daily report cache hits", "# TYPE report_cache_hits_total counter",
+                  f"report_cache_hits_total {cache['hits']}",
+                  "# HELP report_cache_misses_total Daily report cache misses", "# TYPE report_cache_misses_total counter",
+                  f"report_cache_misses_total {cache['misses']}",
+                  "# HELP report_cache_entries Daily reports currently cached", "# TYPE report_cache_entries gauge",
+                  f"report_cache_entries {cache['size']}"]
+        return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+metrics = Metrics()
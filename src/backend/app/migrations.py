@@ -0,0 +1,186 @@
+"""Non-destructive schema upgrades for databases created by older versions.
+
+SQLite cannot change a column's type in place, so a table whose columns no longer
+match the models is rebuilt: a copy with the current schema is filled in chunks
+(converting the old string values on the way) and then swapped in. Each chunk is
+its own transaction, and an interrupted rebuild resumes where it stopped.
+"""
+from contextlib import contextmanager
+from sqlalchemy import inspect, insert, func, select, text
+from sqlalchemy.schema import CreateTable
+from .extensions import db
+from .serialization import parse_value
+
+
+class MigrationError(Exception):
+    pass
+
+
+def run_migrations(echo=print, chunk_size=1000):
+    """Bring the database schema up to date without dropping any data"""
+    finish_interrupted_swaps(echo)
+    existing_tables = set(inspect(db.engine).get_table_names())
+
+    # create_all only adds missing tables, it never touches existing ones
+    db.create_all()
+
+    for table in db.metadata.sorted_tables:
+        if needs_rebuild(table):
+            rebuild_table(table, echo, chunk_size)
+
+    # Indexes on tables that already exist have to be added one by one
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+            echo(f"Index {index.name} ready")
+
+    # A freshly added rollup table has to be backfilled from the existing records
+    if existing_tables and "daily_summary" not in existing_tables:
+        from .summary import rebuild_summaries
+        rebuild_summaries(echo=echo)
+
+    # Ids of archived records must stay taken, whether or not the hot table still has a higher one
+    from .archive import archive
+    if archive.enabled:
+        archive.reserve_ids()
+
+    # Rebuilt tables lost their full-text search triggers, and an older database has no index
+    # yet or one without the indexed child_id column
+    from .search import TABLE, ensure_index, index_outdated, rebuild_index
+    with db.engine.begin() as conn:
+        outdated = index_outdated(conn)
+        if outdated:
+            conn.exec_driver_sql(f"DROP TABLE {TABLE}")
+        ensure_index(conn)
+    if existing_tables and (outdated or TABLE not in existing_tables):
+        rebuild_index(echo=echo)
+
+
+def staging_name(table):
+    return f"{table.name}_migrating"
+
+
+def finish_interrupted_swaps(echo):
+    """Rename a fully copied staging table whose original was already dropped"""
+    tables = set(inspect(db.engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables and staging_name(table) in tables:
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql(f'ALTER TABLE "{staging_name(table)}" RENAME TO "{table.name}"')
+            echo(f"Finished interrupted rebuild of {table.name}")
+
+
+def needs_rebuild(table):
+    """True if the stored columns, column types, foreign keys or AUTOINCREMENT differ from the model"""
+    dialect = db.engine.dialect
+    inspector = inspect(db.engine)
+    existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            return True
+        if existing[column.name]["type"].compile(dialect) != column.type.compile(dialect):
+            return True
+    if dialect.name == "sqlite" and table.dialect_options["sqlite"]["autoincrement"] != autoincrement(table.name):
+        return True
+    return foreign_keys_of(table) != {
+        (tuple(fk["constrained_columns"]), fk["referred_table"], (fk["options"].get("ondelete") or "").upper())
+        for fk in inspector.get_foreign_keys(table.name)
+    }
+
+
+def autoincrement(name):
+    """Whether a stored SQLite table was created with AUTOINCREMENT, which only shows in its DDL"""
+    with db.engine.connect() as conn:
+        sql = conn.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": name})
+    return "AUTOINCREMENT" in (sql or "").upper()
+
+
+def foreign_keys_of(table):
+    """(columns, referred table, ON DELETE action) of every foreign key the model declares"""
+    return {
+        (tuple(constraint.column_keys), constraint.referred_table.name, (constraint.ondelete or "").upper())
+        for constraint in table.foreign_key_constraints
+    }
+
+
+def convert_row(table, row):
+    """Convert one stored row to the current column types"""
+    values = {}
+    for column in table.columns:
+        if column.name not in row:
+            continue
+        value = row[column.name]
+        # Text columns are copied untouched; typed columns may still hold the old strings
+        if not isinstance(value, str) or isinstance(column.type, db.String):
+            values[column.name] = value
+            continue
+        try:
+            values[column.name] = parse_value(column, value.strip())
+        except (ValueError, TypeError):
+            if not column.nullable:
+                key = ", ".join(f"{c.name}={row[c.name]!r}" for c in table.primary_key)
+                raise MigrationError(
+                    f"{table.name} row {key}: cannot convert {column.name}={value!r}; "
+                    f"fix the value and run the migration again"
+                )
+            values[column.name] = None
+    return values
+
+
+@contextmanager
+def foreign_keys_off():
+    """A connection with foreign key enforcement off, restored before it goes back to the pool"""
+    with db.engine.connect() as conn:
+        enabled = conn.exec_driver_sql("PRAGMA foreign_keys").scalar()
+        conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"PRAGMA foreign_keys={enabled}")
+
+
+def rebuild_table(table, echo, chunk_size):
+    staging = table.to_metadata(db.metadata, name=staging_name(table))
+    # Rows are copied in primary key order, so the copy can resume after the last copied key
+    key = [column.name for column in table.primary_key]
+    key_sql = ", ".join(f'"{name}"' for name in key)
+    after_key = f"({key_sql}) > ({', '.join(f':{name}' for name in key)})"
+    try:
+        with db.engine.begin() as conn:
+            if not inspect(conn).has_table(staging.name):
+                # CreateTable emits the table only; indexes are added after the swap
+                conn.execute(CreateTable(staging))
+
+        with db.engine.connect() as conn:
+            copied = conn.scalar(select(func.count()).select_from(staging))
+            last_key = conn.execute(
+                text(f'SELECT {key_sql} FROM "{staging.name}" ORDER BY {key_sql} DESC LIMIT 1')
+            ).mappings().first()
+
+        # Rows are copied as they are, including any left behind by deletes
+        # made before foreign keys were enforced
+        with foreign_keys_off() as conn:
+            while True:
+                # Read raw values so the old strings are not run through the new column types
+                rows = conn.execute(
+                    text(f'SELECT * FROM "{table.name}" {"WHERE " + after_key if last_key else ""} '
+                         f'ORDER BY {key_sql} LIMIT :limit'),
+                    {**(last_key or {}), "limit": chunk_size}
+                ).mappings().all()
+                if not rows:
+                    break
+                conn.execute(insert(staging), [convert_row(table, row) for row in rows])
+                conn.commit()
+                last_key = {name: rows[-1][name] for name in key}
+                copied += len(rows)
+                echo(f"{table.name}: {copied} rows converted")
+
+        # Dropping a parent table must not trip foreign key enforcement
+        with foreign_keys_off() as conn:
+            conn.exec_driver_sql(f'DROP TABLE "{table.name}"')
+            conn.exec_driver_sql(f'ALTER TABLE "{staging.name}" RENAME TO "{table.name}"')
+            conn.commit()
+        echo(f"Rebuilt {table.name}")
+    finally:
+        db.metadata.remove(staging)
@@ -1,73 +1,163 @@
 from .extensions import db
 
+
+class ChangeTracked:
+    """Columns every record table carries for delta sync (see /children/<id>/changes).
+
+    Record tables are also declared with sqlite_autoincrement, so an id is never handed out
+    twice, even after the newest record was deleted; archived and tombstoned ids stay unique.
+    """
+    # Change version of the write that created the row; 0 for rows predating versioning
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+
 # Child information
 class Child(db.Model):
     __tablename__ = 'child'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(20), nullable=False)
     sex = db.Column(db.String(20), nullable=False)
-    date_of_birth = db.Column(db.String(20), nullable=False)
+    date_of_birth = db.Column(db.Date, nullable=False)
+    # Change version of the last write to the child or its records; every worker checks
+    # its cached reports against it
+    data_version = db.Column(db.Integer, nullable=False, default=0)
     
-    # Define relationships with cascade delete
-    sleep_records = db.relationship('SleepRecord', backref='child', cascade='all, delete-orphan')
-    feeding_records = db.relationship('FeedingRecord', backref='child', cascade='all, delete-orphan')
-    nappy_change_records = db.relationship('NappyChangeRecord', backref='child', cascade='all, delete-orphan')
-    medication_records = db.relationship('MedicationRecord', backref='child', cascade='all, delete-orphan')
-    temperature_records = db.relationship('TemperatureRecord', backref='child', cascade='all, delete-orphan')
-    growth_records = db.relationship('GrowthRecord', backref='child', cascade='all, delete-orphan')
+    # Define relationships with cascade delete; the database removes the rows (ON DELETE CASCADE),
+    # so deleting a child never loads its history
+    sleep_records = db.relationship('SleepRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    feeding_records = db.relationship('FeedingRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    nappy_change_records = db.relationship('NappyChangeRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    medication_records = db.relationship('MedicationRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    temperature_records = db.relationship('TemperatureRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    growth_records = db.relationship('GrowthRecord', backref='child', cascade='all, delete-orphan', passive_deletes=True)
+    daily_summaries = db.relationship('DailySummary', backref='child', cascade='all, delete-orphan', passive_deletes=True)
 
 # Sleep Record
-class SleepRecord(db.Model):
+class SleepRecord(ChangeTracked, db.Model):
     __tablename__ = 'sleep_record'
+    __table_args__ = (
+        db.Index('ix_sleep_record_child_date', 'child_id', 'sleep_date', 'start_time'),
+        db.Index('ix_sleep_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    sleep_date = db.Column(db.String(20), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    sleep_date = db.Column(db.Date, nullable=False)
     sleep_type = db.Column(db.String(20), nullable=False)
-    start_time = db.Column(db.String(20), nullable=False)
-    end_time = db.Column(db.String(20), nullable=False)
+    start_time = db.Column(db.Time, nullable=False)
+    end_time = db.Column(db.Time, nullable=False)
     # duration = db.Column(db.String(20), nullable=False)
 
-class FeedingRecord(db.Model):
+class FeedingRecord(ChangeTracked, db.Model):
     __tablename__ = 'feeding_record'
+    __table_args__ = (
+        db.Index('ix_feeding_record_child_date', 'child_id', 'feed_date', 'feed_time'),
+        db.Index('ix_feeding_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    feed_date = db.Column(db.String(20), nullable=False)
-    feed_time = db.Column(db.String(20), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    feed_date = db.Column(db.Date, nullable=False)
+    feed_time = db.Column(db.Time, nullable=False)
     feed_type = db.Column(db.String(20), nullable=False)
     food_name = db.Column(db.String(20), nullable=True)
+    # Free text: millilitres for liquid feeds, a description for solids
     feed_amount = db.Column(db.String(20), nullable=True)
     # feed_solid_amount = db.Column(db.Float, nullable=True)
     # feed_liquid_amount = db.Column(db.String(20), nullable=True)
 
-class NappyChangeRecord(db.Model):
+class NappyChangeRecord(ChangeTracked, db.Model):
     __tablename__ = 'nappy_change_record'
+    __table_args__ = (
+        db.Index('ix_nappy_change_record_child_date', 'child_id', 'change_date', 'change_time'),
+        db.Index('ix_nappy_change_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    change_date = db.Column(db.String(20), nullable=False)
-    change_time = db.Column(db.String(20), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    change_date = db.Column(db.Date, nullable=False)
+    change_time = db.Column(db.Time, nullable=False)
     change_type = db.Column(db.String(20), nullable=False)
 
-class MedicationRecord(db.Model):
+class MedicationRecord(ChangeTracked, db.Model):
     __tablename__ = 'medication_record'
+    __table_args__ = (
+        db.Index('ix_medication_record_child_date', 'child_id', 'medication_date', 'medication_time'),
+        db.Index('ix_medication_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    medication_date = db.Column(db.String(20), nullable=False)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    medication_date = db.Column(db.Date, nullable=False)
     medication_type = db.Column(db.String(20), nullable=False)
-    medication_time = db.Column(db.String(20), nullable=False)
+    medication_time = db.Column(db.Time, nullable=False)
+    # Free text such as "2.5ml" or "1 tablet", so it stays a string
     dosage = db.Column(db.String(20), nullable=False)
 
-class TemperatureRecord(db.Model):
+class TemperatureRecord(ChangeTracked, db.Model):
     __tablename__ = 'temperature_record'
+    __table_args__ = (
+        db.Index('ix_temperature_record_child_date', 'child_id', 'date', 'temperature_time'),
+        db.Index('ix_temperature_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    date = db.Column(db.String(20), nullable=False)
-    temperature = db.Column(db.String(10), nullable=True)
-    temperature_time = db.Column(db.String(20), nullable=True)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    temperature = db.Column(db.Float, nullable=True)
+    temperature_time = db.Column(db.Time, nullable=True)
 
-class GrowthRecord(db.Model):
+class GrowthRecord(ChangeTracked, db.Model):
     __tablename__ = 'growth_record'
+    # Growth has no time column, so the index stops at the date
+    __table_args__ = (
+        db.Index('ix_growth_record_child_date', 'child_id', 'growth_date'),
+        db.Index('ix_growth_record_child_version', 'child_id', 'version'),
+        {'sqlite_autoincrement': True},
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    growth_date = db.Column(db.Date, nullable=False)
+    weight = db.Column(db.Float, nullable=False)
+    height = db.Column(db.Float, nullable=False)
+
+# Per-child daily rollup, kept in step with the record tables by every write path
+class DailySummary(db.Model):
+    __tablename__ = 'daily_summary'
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    sleep_count = db.Column(db.Integer, nullable=False, default=0)
+    naps_count = db.Column(db.Integer, nullable=False, default=0)
+    sleep_minutes = db.Column(db.Integer, nullable=False, default=0)
+    feeds_count = db.Column(db.Integer, nullable=False, default=0)
+    nappy_changes = db.Column(db.Integer, nullable=False, default=0)
+    medication_count = db.Column(db.Integer, nullable=False, default=0)
+    temperature_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Single-row counter handing out change versions, one per committed write
+class ChangeCounter(db.Model):
+    __tablename__ = 'change_counter'
     id = db.Column(db.Integer, primary_key=True)
-    child_id = db.Column(db.Integer, db.ForeignKey('child.id'), nullable=False)
-    growth_date = db.Column(db.String(10), nullable=False)
-    weight = db.Column(db.String(10), nullable=False)
-    height = db.Column(db.String(10), nullable=False)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# Deleted records, so delta sync can tell clients to drop them
+class Tombstone(db.Model):
+    __tablename__ = 'record_tombstone'
+    __table_args__ = (
+        db.Index('ix_record_tombstone_child_version', 'child_id', 'version'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), nullable=False)
+    record_type = db.Column(db.String(20), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+
+# Reports rendered ahead of time by `flask reports generate`, one JSON body per child and day
+class GeneratedReport(db.Model):
+    __tablename__ = 'generated_report'
+    child_id = db.Column(db.Integer, db.ForeignKey('child.id', ondelete='CASCADE'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    body = db.Column(db.Text, nullable=False)
+    generated_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
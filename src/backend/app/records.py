@@ -0,0 +1,357 @@
+import base64
+import json
+from datetime import date, time
+from flask import current_app
+from sqlalchemy import and_, delete, func, insert, literal_column, or_, select, tuple_, union_all
+from .extensions import db
+from .archive import archive
+from .changes import change_version, latest_version, mark_changed
+from .serialization import parse_date, parse_value
+from .models import Child, Tombstone, SleepRecord, FeedingRecord, NappyChangeRecord, MedicationRecord, TemperatureRecord, GrowthRecord
+
+
+class RecordType:
+    """Describes how one record model is exposed through the API"""
+
+    def __init__(self, name, model, label, fields, required, date_field, time_field=None):
+        self.name = name
+        self.model = model
+        self.label = label
+        self.fields = fields
+        self.required = required
+        self.date_field = date_field
+        self.time_field = time_field
+        # Result keys in select order, so rows can be zipped into dicts without a per-row key lookup
+        self.keys = ["id", "child_id"] + fields
+
+    @property
+    def date_column(self):
+        return getattr(self.model, self.date_field)
+
+    @property
+    def time_column(self):
+        return getattr(self.model, self.time_field) if self.time_field else None
+
+    def order_columns(self, table=None):
+        """Keyset used for paging: (date, time, id), newest first; of an archive table when given"""
+        source = self.model if table is None else table.c
+        keys = [self.date_field] + ([self.time_field] if self.time_field else []) + ["id"]
+        return [getattr(source, key) for key in keys]
+
+    def values_of(self, record):
+        """Field values of a loaded ORM record, keyed like incoming JSON"""
+        return {field: getattr(record, field) for field in self.fields}
+
+    def columns(self, with_child_id=True, table=None):
+        """Columns returned by the list endpoints, in response order; of an archive table when given"""
+        source = self.model if table is None else table.c
+        keys = self.keys if with_child_id else ["id"] + self.fields
+        return [getattr(source, key) for key in keys]
+
+    def to_dicts(self, rows):
+        """Map Core rows selected with columns() to result dicts"""
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+
+# Keyed by the URL segment each record blueprint is mounted on
+RECORD_TYPES = {
+    "sleep": RecordType(
+        "sleep", SleepRecord, "Sleep",
+        fields=["sleep_date", "sleep_type", "start_time", "end_time"],
+        required=["sleep_date", "sleep_type", "start_time", "end_time"],
+        date_field="sleep_date", time_field="start_time"
+    ),
+    "feed": RecordType(
+        "feed", FeedingRecord, "Feeding",
+        fields=["feed_date", "feed_time", "food_name", "feed_type", "feed_amount"],
+        required=["feed_date", "feed_time", "feed_type"],
+        date_field="feed_date", time_field="feed_time"
+    ),
+    "nappy": RecordType(
+        "nappy", NappyChangeRecord, "Nappy",
+        fields=["change_date", "change_time", "change_type"],
+        required=["change_date", "change_time", "change_type"],
+        date_field="change_date", time_field="change_time"
+    ),
+    "medication": RecordType(
+        "medication", MedicationRecord, "Medication",
+        fields=["medication_date", "medication_time", "medication_type", "dosage"],
+        required=["medication_date", "medication_time", "medication_type", "dosage"],
+        date_field="medication_date", time_field="medication_time"
+    ),
+    "temperature": RecordType(
+        "temperature", TemperatureRecord, "Temperature",
+        fields=["date", "temperature", "temperature_time"],
+        required=["date", "temperature", "temperature_time"],
+        date_field="date", time_field="temperature_time"
+    ),
+    "growth": RecordType(
+        "growth", GrowthRecord, "Growth",
+        fields=["growth_date", "weight", "height"],
+        required=["growth_date", "weight", "height"],
+        date_field="growth_date"
+    ),
+}
+
+
+# Shapes the list endpoints can answer in, chosen with ?format=
+LIST_FORMATS = ["objects", "columnar"]
+
+
+def parse_date_arg(value, name):
+    """Parse an optional YYYY-MM-DD query argument, raising ValueError with a readable message"""
+    if not value:
+        return None
+    try:
+        return parse_date(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+def parse_format_arg(value):
+    """Whether a list response was asked for in the columnar shape"""
+    if value is None:
+        return False
+    if value not in LIST_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(LIST_FORMATS)}")
+    return value == "columnar"
+
+
+def record_tables(record_type, date_from=None):
+    """Where records from date_from on (None: the whole history) live: the hot table, and the
+    archive table (None stands for the model's own) when the range reaches back into it"""
+    tables = [None]
+    if archive.covers(date_from):
+        tables.append(archive.table(record_type))
+    return tables
+
+
+def select_records(record_type, child_id, date_from=None, date_to=None, with_child_id=True, before=None):
+    """Build a column-only select of one child's records, optionally limited to a date range.
+
+    child_id may also be a list, selecting the records of several children at once.
+    A range reaching back past the archive cutoff gets the archived rows added with UNION ALL.
+    `before` takes the keyset values of a page cursor and keeps only the rows ordered after it.
+    """
+    date_from = parse_date_arg(date_from, "from")
+    date_to = parse_date_arg(date_to, "to")
+    queries = []
+    for table in record_tables(record_type, date_from):
+        source = record_type.model if table is None else table.c
+        date_column = getattr(source, record_type.date_field)
+        owner = source.child_id.in_(child_id) if isinstance(child_id, list) else source.child_id == child_id
+        query = select(*record_type.columns(with_child_id, table)).where(owner)
+        if date_from:
+            query = query.where(date_column >= date_from)
+        if date_to:
+            query = query.where(date_column <= date_to)
+        if before is not None:
+            query = query.where(ordered_after(record_type.order_columns(table), before))
+        queries.append(query)
+    return queries[0] if len(queries) == 1 else union_all(*queries)
+
+
+def ordered_after(columns, before):
+    """Condition keeping the rows that follow the keyset `before` in newest-first order"""
+    date_column, *rest = columns
+    if len(rest) == 1 or not rest[0].nullable:
+        return tuple_(*columns) < tuple_(*before)
+    # A nullable time (temperature): SQLite sorts NULL below every time, but a row-value
+    # comparison involving NULL is NULL and would end the paging early
+    time_column, id_column = rest
+    day, moment, last_id = before
+    if moment is None:
+        return or_(date_column < day, and_(date_column == day, time_column.is_(None), id_column < last_id))
+    return or_(
+        date_column < day,
+        and_(date_column == day, or_(time_column < moment, time_column.is_(None))),
+        and_(date_column == day, time_column == moment, id_column < last_id),
+    )
+
+
+def order_by_keys(query, record_type, descending=False):
+    """Order a select_records query, plain or a UNION, by the paging keyset"""
+    # Bare result column names work for both; a compound select can't refer to its tables' columns
+    columns = [literal_column(column.key) for column in record_type.order_columns()]
+    return query.order_by(*[column.desc() if descending else column for column in columns])
+
+
+def fetch_records(record_type, child_id, date_from=None, date_to=None, columnar=False):
+    """Return one child's records of a single type as plain dicts, or in the columnar shape, oldest first"""
+    # Ordered explicitly, since a UNION with the archive returns the hot rows first
+    query = order_by_keys(select_records(record_type, child_id, date_from, date_to, with_child_id=not columnar),
+                          record_type)
+    rows = db.session.execute(query)
+    if columnar:
+        return columnar_results(record_type, child_id, rows)
+    return record_type.to_dicts(rows)
+
+
+def columnar_results(record_type, child_id, rows):
+    """Column names once and one array per record, with the shared child_id hoisted out.
+
+    Rows must come from a select without child_id; the Core row tuples are encoded as they are.
+    """
+    return {
+        "child_id": child_id,
+        "columns": ["id"] + record_type.fields,
+        "rows": [tuple(row) for row in rows],
+    }
+
+
+def encode_cursor(values):
+    """Turn the keyset of the last returned row into an opaque cursor"""
+    # Full precision rather than the HH:MM wire format, or rows within the same minute are skipped
+    values = [value.isoformat() if isinstance(value, (date, time)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [parse_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def list_records(record_type, child_id, args):
+    """Records for a list endpoint, honouring from/to filters and keyset pagination.
+
+    Without limit or cursor the whole (filtered) history is returned in one response.
+    Either way records come newest first, by (date, time, id); before paging existed the
+    sleep list was ordered by start time and the other lists by insertion.
+    Returns the result dicts (or the columnar shape with format=columnar) and the
+    cursor for the next page (None on the last page).
+    """
+    columnar = parse_format_arg(args.get("format"))
+    order_columns = record_type.order_columns()
+
+    def shape(rows):
+        if columnar:
+            return columnar_results(record_type, child_id, rows)
+        return record_type.to_dicts(rows)
+
+    def ordered(before=None):
+        query = select_records(
+            record_type, child_id, args.get("from"), args.get("to"), with_child_id=not columnar, before=before
+        )
+        return order_by_keys(query, record_type, descending=True)
+
+    limit = args.get("limit")
+    cursor = args.get("cursor")
+    if limit is None and cursor is None:
+        return shape(db.session.execute(ordered())), None
+
+    max_limit = current_app.config["MAX_PAGE_SIZE"]
+    try:
+        limit = int(limit) if limit is not None else max_limit
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    limit = min(limit, max_limit)
+
+    query = ordered(decode_cursor(cursor, order_columns) if cursor else None)
+
+    # Fetch one extra row to know whether another page follows
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]._mapping
+        next_cursor = encode_cursor([last[column.key] for column in order_columns])
+    return shape(rows[:limit]), next_cursor
+
+
+def record_values(record_type, data):
+    """Convert an incoming record's fields to column values, raising ValueError naming the bad field"""
+    values = {}
+    for field in record_type.fields:
+        column = getattr(record_type.model, field)
+        try:
+            values[field] = parse_value(column, data.get(field))
+        except (ValueError, TypeError):
+            raise ValueError(f"Invalid value for {field}")
+        # An empty string parses to None, which a NOT NULL column would only reject at insert time
+        if values[field] is None and not column.nullable:
+            raise ValueError(f"Invalid value for {field}")
+    return values
+
+
+def prepare_record(record_type, data):
+    """Validate an incoming record and return its column values; raises ValueError if it can't be inserted"""
+    if not isinstance(data, dict):
+        raise ValueError("Record must be an object")
+    if not all(key in data for key in record_type.required):
+        raise ValueError("Missing required fields")
+    return record_values(record_type, data)
+
+
+def insert_records(record_type, child_id, rows):
+    """Insert prepared records in one executemany statement and return their ids in order"""
+    model = record_type.model
+    version = change_version()
+    rows = [dict(values, child_id=child_id, version=version) for values in rows]
+    if db.session.get_bind().dialect.name != "sqlite":
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(db.session.execute(statement, rows).scalars())
+
+    # SQLite doesn't promise RETURNING order, so SQLAlchemy would fall back to one INSERT per row.
+    # The transaction holds the write lock and AUTOINCREMENT hands out consecutive ids above
+    # every id ever used, so the batch occupies exactly the last len(rows) ids.
+    db.session.execute(insert(model), rows)
+    last_id = db.session.scalar(select(func.max(model.id)))
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+def changes_since(child_id, since):
+    """Records of a child created or deleted after change version `since`.
+
+    Returns the new sync token with the changed rows and the ids of deleted rows per type.
+    The token is read first, so a write committing meanwhile is sent again next time
+    rather than skipped.
+    """
+    version = latest_version()
+    changed = {}
+    for name, record_type in RECORD_TYPES.items():
+        model = record_type.model
+        query = (
+            select(*record_type.columns())
+            .where(model.child_id == child_id, model.version > since)
+            .order_by(model.version, model.id)
+        )
+        changed[name] = record_type.to_dicts(db.session.execute(query))
+
+    deleted = {name: [] for name in RECORD_TYPES}
+    tombstones = select(Tombstone.record_type, Tombstone.record_id).where(
+        Tombstone.child_id == child_id, Tombstone.version > since
+    ).order_by(Tombstone.version, Tombstone.id)
+    for record_type, record_id in db.session.execute(tombstones):
+        deleted.setdefault(record_type, []).append(record_id)
+    return {"version": version, "changed": changed, "deleted": deleted}
+
+
+def purge_children(child_ids):
+    """Delete children together with their whole history; returns the ids that existed.
+
+    One DELETE on child, however long the histories: the record and summary rows go
+    through ON DELETE CASCADE inside the database, so nothing is loaded into Python.
+    """
+    statement = (
+        delete(Child).where(Child.id.in_(child_ids)).returning(Child.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = list(db.session.scalars(statement))
+    # The archive is another database file, out of reach of the foreign keys
+    if archive.enabled and deleted:
+        for record_type in RECORD_TYPES.values():
+            table = archive.table(record_type)
+            db.session.execute(delete(table).where(table.c.child_id.in_(deleted)))
+        # Nor do the archived rows have triggers to take them out of the search index
+        from .search import remove_children
+        remove_children(deleted)
+    for child_id in deleted:
+        mark_changed(child_id)
+    return deleted
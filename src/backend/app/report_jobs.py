@@ -0,0 +1,96 @@
+"""Generate every child's daily report for a date, sharded over a pool of processes.
+
+Each process builds its own app, and with it its own engine and connection pool, then
+renders whole shards with build_daily_reports. The reports go to the generated_report
+table or to one NDJSON file per shard, so processes never write to the same file.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from flask import current_app
+from sqlalchemy import func, select
+from .extensions import db
+from .models import Child, GeneratedReport
+from .reports import build_daily_reports
+from .summary import UPSERT_DIALECTS
+
+OUTPUTS = ["table", "ndjson"]
+
+# The app of a pool process, created by init_worker
+worker_app = None
+
+
+def init_worker(config):
+    global worker_app
+    from . import create_app
+    worker_app = create_app(config)
+
+
+def generate_shard(*args):
+    """write_shard inside a pool process"""
+    with worker_app.app_context():
+        return write_shard(*args)
+
+
+def write_shard(shard, child_ids, date, output, directory):
+    """Render and store the reports of one shard of children; returns how many were written"""
+    reports = build_daily_reports(child_ids, date)
+    dumps = current_app.json.dumps
+    if output == "ndjson":
+        path = os.path.join(directory, f"reports-{date.isoformat()}-{shard:04d}.ndjson")
+        with open(path, "w", encoding="utf-8") as file:
+            for report in reports.values():
+                file.write(dumps(report) + "\n")
+        return len(reports)
+
+    if reports:
+        insert = UPSERT_DIALECTS[db.session.get_bind().dialect.name]
+        statement = insert(GeneratedReport)
+        statement = statement.on_conflict_do_update(
+            index_elements=[GeneratedReport.child_id, GeneratedReport.date],
+            set_={"body": statement.excluded.body, "generated_at": func.current_timestamp()}
+        )
+        db.session.execute(statement, [
+            {"child_id": child_id, "date": date, "body": dumps(report)} for child_id, report in reports.items()
+        ])
+        db.session.commit()
+    return len(reports)
+
+
+def generate_reports(date, output="table", directory=".", workers=None, shard_size=100, echo=print):
+    """Write the reports of every child for a date; returns (reports written, seconds taken).
+
+    With one worker the shards are rendered in this process. Otherwise the pool processes
+    build their apps from this app's config, so they open the same database.
+    """
+    child_ids = db.session.scalars(select(Child.id).order_by(Child.id)).all()
+    shards = [child_ids[start:start + shard_size] for start in range(0, len(child_ids), shard_size)]
+    if output == "ndjson":
+        os.makedirs(directory, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    echo(f"Generating {len(child_ids)} reports for {date} in {len(shards)} shards on {workers} workers")
+
+    written = 0
+    start = time.perf_counter()
+
+    def progress(count):
+        nonlocal written
+        written += count
+        elapsed = time.perf_counter() - start
+        echo(f"  {written}/{len(child_ids)} reports, {written / elapsed:.0f}/s")
+
+    if workers == 1:
+        for index, shard in enumerate(shards):
+            progress(write_shard(index, shard, date, output, directory))
+    else:
+        # Pool processes open their own connections; don't let them inherit this one's
+        db.session.close()
+        db.engine.dispose()
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(dict(current_app.config),)) as pool:
+            futures = [
+                pool.submit(generate_shard, index, shard, date, output, directory)
+                for index, shard in enumerate(shards)
+            ]
+            for future in as_completed(futures):
+                progress(future.result())
+    return written, time.perf_counter() - start
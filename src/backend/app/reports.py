@@ -0,0 +1,112 @@
+from datetime import timedelta
+from sqlalchemy import literal_column, select
+from .extensions import db
+from .records import RECORD_TYPES, select_records
+from .summary import COUNTERS, calculate_duration_minutes
+from .models import Child, DailySummary
+
+# Report section -> (record type, fields listed for each record)
+REPORT_SECTIONS = {
+    "sleep": ("sleep", ["sleep_type", "start_time", "end_time"]),
+    "feeding": ("feed", ["feed_time", "feed_type", "food_name", "feed_amount"]),
+    "nappy": ("nappy", ["change_time", "change_type"]),
+    "medication": ("medication", ["medication_time", "medication_type", "dosage"]),
+    "temperature": ("temperature", ["temperature_time", "temperature"]),
+    "growth": ("growth", ["weight", "height"]),
+}
+
+
+def build_daily_reports(child_ids, date):
+    """Daily report payloads for several children at once; returns {child_id: report} for those that exist.
+
+    The number of queries doesn't depend on how many children are asked for: one for the
+    children, one IN-filtered select per record table and one for the week of summaries.
+    """
+    children = db.session.scalars(select(Child).where(Child.id.in_(child_ids))).all()
+    found = [child.id for child in children]
+    if not found:
+        return {}
+
+    records = {child_id: {section: [] for section in REPORT_SECTIONS} for child_id in found}
+    for section, (name, fields) in REPORT_SECTIONS.items():
+        record_type = RECORD_TYPES[name]
+        # A day before the archive cutoff reads the archived records too
+        query = select_records(record_type, found, date, date)
+        # In time order within the day, which the (child_id, date, time) indexes return directly
+        order = [record_type.time_field] if record_type.time_field else []
+        query = query.order_by(*[literal_column(key) for key in ["child_id", *order, "id"]])
+        keys = ["id"] + fields
+        for row in db.session.execute(query):
+            row = row._mapping
+            record = {key: row[key] for key in keys}
+            if section == "sleep":
+                record["duration_minutes"] = calculate_duration_minutes(record["start_time"], record["end_time"])
+            records[row["child_id"]][section].append(record)
+
+    # Daily rollups for the last week: one summary row per day instead of every sleep record
+    summaries = {child_id: [] for child_id in found}
+    for day in db.session.scalars(select(DailySummary).where(
+        DailySummary.child_id.in_(found),
+        DailySummary.date >= date - timedelta(days=7),
+        DailySummary.date <= date
+    )):
+        summaries[day.child_id].append(day)
+
+    return {
+        child.id: daily_report(child, date, summaries[child.id], records[child.id])
+        for child in children
+    }
+
+
+def daily_report(child, date, summaries, records):
+    """Assemble one child's report from its week of summaries and the day's records"""
+    # Calculate sleep stats over the days that have sleep records
+    sleep_days = [day for day in summaries if day.sleep_count > 0]
+    days_count = len(sleep_days) or 1  # Avoid division by zero
+    total_sleep_minutes = sum(day.sleep_minutes for day in sleep_days)
+    sleep_stats = {
+        "total_sleep_minutes": total_sleep_minutes,
+        "avg_naps_per_day": round(sum(day.naps_count for day in sleep_days) / days_count, 1),
+        "avg_sleep_hours": round(total_sleep_minutes / days_count / 60, 1)
+    }
+
+    # Today's records summary
+    today = next((day for day in summaries if day.date == date), None) or DailySummary(
+        **{key: 0 for key in COUNTERS}
+    )
+
+    today_summary = {
+        "sleep_hours": round(today.sleep_minutes / 60, 1),
+        "naps_count": today.naps_count,
+        "feeds_count": today.feeds_count,
+        "nappy_changes": today.nappy_changes,
+        "medication_given": today.medication_count > 0,
+        "temperature_taken": today.temperature_count > 0
+    }
+
+    return {
+        "child": {
+            "id": child.id,
+            "name": child.name,
+            "sex": child.sex,
+            "date_of_birth": child.date_of_birth,
+            "age_months": calculate_age_months(child.date_of_birth, date)
+        },
+        "date": date,
+        "today_summary": today_summary,
+        "weekly_stats": {
+            "sleep": sleep_stats
+        },
+        "records": records
+    }
+
+
+def calculate_age_months(birth_date, current_date):
+    """Calculate age in months from birth date to current date"""
+    months = (current_date.year - birth_date.year) * 12 + (current_date.month - birth_date.month)
+
+    # Adjust for day of month
+    if current_date.day < birth_date.day:
+        months -= 1
+
+    return months
@@ -1,6 +1,9 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, abort, jsonify, request
 from ..models import Child
 from ..extensions import db
+from ..serialization import parse_date
+from ..changes import mark_changed
+from ..records import purge_children
 
 child_bp = Blueprint("child", __name__, url_prefix="/children")
 
@@ -33,10 +36,15 @@ def get_child(id):
 @child_bp.route("/", methods=["POST"])
 def add_child():
     data = request.json
+    try:
+        date_of_birth = parse_date(data.get("date_of_birth"))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid value for date_of_birth"}), 400
+
     child = Child(
         name=data.get("name"),
         sex=data.get("sex"),
-        date_of_birth=data.get("date_of_birth")
+        date_of_birth=date_of_birth
     )
     db.session.add(child)
     db.session.commit()
@@ -46,15 +54,21 @@ def add_child():
 def update_child(id):
     child = Child.query.get_or_404(id)
     data = request.json
+    try:
+        date_of_birth = parse_date(data.get("date_of_birth", child.date_of_birth))
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid value for date_of_birth"}), 400
+
     child.name = data.get("name", child.name)
     child.sex = data.get("sex", child.sex)
-    child.date_of_birth = data.get("date_of_birth", child.date_of_birth)
+    child.date_of_birth = date_of_birth
+    mark_changed(child.id)
     db.session.commit()
     return jsonify({"status": "success", "message": "Child updated"})
 
 @child_bp.route("/<int:id>", methods=["DELETE"])
 def delete_child(id):
-    child = Child.query.get_or_404(id)
-    db.session.delete(child)
+    if not purge_children([id]):
+        abort(404)
     db.session.commit()
     return jsonify({"status": "success", "message": "Child deleted"})
\ No newline at end of file
@@ -0,0 +1,82 @@
+from concurrent.futures import TimeoutError
+from flask import Blueprint, abort, jsonify, request
+from sqlalchemy import delete, insert, select
+from ..extensions import db
+from ..models import Child
+from ..records import list_records, prepare_record, record_tables
+from ..changes import change_version, record_deleted, records_created
+from ..search import SEARCHABLE, remove_entry
+from ..summary import update_summary
+from ..write_queue import QueueFull, write_queue
+
+
+def record_blueprint(record_type):
+    """Blueprint with the list, create and delete routes of one record type.
+
+    Every route goes through SQLAlchemy Core: lists select only the exposed columns,
+    creates insert the parsed values and deletes read back just the fields the daily
+    summary needs, so no ORM objects are built for record rows.
+    """
+    blueprint = Blueprint(record_type.name, __name__)
+    model = record_type.model
+    collection_url = f"/children/<int:child_id>/{record_type.name}"
+
+    @blueprint.route(collection_url, methods=["GET"])
+    def list_view(child_id):
+        try:
+            results, next_cursor = list_records(record_type, child_id, request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"status": "success", "results": results, "next_cursor": next_cursor})
+
+    @blueprint.route(collection_url, methods=["POST"])
+    def create_view(child_id):
+        Child.query.get_or_404(child_id)
+        try:
+            values = prepare_record(record_type, request.json)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        if write_queue.enabled:
+            # End this request's read transaction so it can't hold up the writer's commit
+            db.session.close()
+            try:
+                record_id = write_queue.insert(record_type, child_id, values)
+            except QueueFull:
+                return jsonify({"error": "Too many pending writes, retry shortly"}), 503, {"Retry-After": "1"}
+            except TimeoutError:
+                return jsonify({"error": "Timed out waiting for the write; the record was not added"}), 503
+        else:
+            result = db.session.execute(insert(model).values(child_id=child_id, version=change_version(), **values))
+            record_id = result.inserted_primary_key[0]
+            update_summary(record_type, child_id, [values])
+            records_created(record_type, child_id, [{"id": record_id, "child_id": child_id, **values}])
+            db.session.commit()
+        return jsonify({
+            "status": "success",
+            "message": f"{record_type.label} record added",
+            "id": record_id
+        }), 201
+
+    @blueprint.route(f"{collection_url}/<int:record_id>", methods=["DELETE"])
+    def delete_view(child_id, record_id):
+        # Old records may have been moved to the archive
+        for table in record_tables(record_type):
+            table = model.__table__ if table is None else table
+            row = db.session.execute(
+                select(*[table.c[field] for field in record_type.fields])
+                .where(table.c.id == record_id, table.c.child_id == child_id)
+            ).first()
+            if row is not None:
+                break
+        else:
+            abort(404)
+        update_summary(record_type, child_id, [dict(zip(record_type.fields, row))], sign=-1)
+        db.session.execute(delete(table).where(table.c.id == record_id, table.c.child_id == child_id))
+        if table is not model.__table__ and record_type.name in SEARCHABLE:
+            remove_entry(record_type.name, record_id)
+        record_deleted(record_type, child_id, record_id)
+        db.session.commit()
+        return jsonify({"status": "success", "message": f"{record_type.label} record deleted"})
+
+    return blueprint
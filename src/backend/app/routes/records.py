@@ -0,0 +1,167 @@
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from ..models import Child
+from ..extensions import db
+from ..records import RECORD_TYPES, changes_since, fetch_records, parse_format_arg, prepare_record, insert_records
+from ..changes import latest_version, records_created
+from ..summary import update_summary
+from ..export import FORMATS, export_child
+from ..events import change_events
+
+records_bp = Blueprint("records", __name__)
+
+
+@records_bp.route("/children/<int:child_id>/records", methods=["GET"])
+def get_all_records(child_id):
+    """Every record type for a child in one response, optionally filtered by types and date range"""
+    types = request.args.get("types")
+    names = types.split(",") if types else list(RECORD_TYPES)
+    unknown = [name for name in names if name not in RECORD_TYPES]
+    if unknown:
+        return jsonify({"error": f"Unknown record types: {', '.join(unknown)}"}), 400
+
+    date_from = request.args.get("from")
+    date_to = request.args.get("to")
+
+    # One column-only select per requested type, all on the same connection
+    try:
+        columnar = parse_format_arg(request.args.get("format"))
+        # Sync token for /changes, read before the records so no write falls in between
+        version = latest_version()
+        results = {
+            name: fetch_records(RECORD_TYPES[name], child_id, date_from, date_to, columnar)
+            for name in names
+        }
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"status": "success", "results": results, "version": version})
+
+
+@records_bp.route("/children/<int:child_id>/changes", methods=["GET"])
+def get_changes(child_id):
+    """Records created or deleted since a sync token, so a refresh costs O(changes) rather than O(history)"""
+    since = request.args.get("since", type=int)
+    if since is None or since < 0:
+        return jsonify({"error": "since must be a non-negative sync token"}), 400
+    Child.query.get_or_404(child_id)
+    return jsonify({"status": "success", "results": changes_since(child_id, since)})
+
+
+@records_bp.route("/children/<int:child_id>/events", methods=["GET"])
+def get_events(child_id):
+    """Server-Sent Events stream of the child's record creates and deletes, resumable with Last-Event-ID"""
+    since = request.headers.get("Last-Event-ID", request.args.get("since"))
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            since = -1
+        if since < 0:
+            return jsonify({"error": "Last-Event-ID must be a non-negative sync token"}), 400
+    Child.query.get_or_404(child_id)
+
+    return Response(
+        stream_with_context(change_events(child_id, since, current_app.config["EVENTS_HEARTBEAT"])),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@records_bp.route("/children/<int:child_id>/export", methods=["GET"])
+def export_records(child_id):
+    """Stream a child's full history as NDJSON or CSV without building it in memory"""
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(FORMATS)}"}), 400
+    Child.query.get_or_404(child_id)
+
+    return Response(
+        stream_with_context(export_child(child_id, export_format)),
+        mimetype=FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename=child-{child_id}.{export_format}"}
+    )
+
+
+@records_bp.route("/children/<int:child_id>/<record_type>/bulk", methods=["POST"])
+def add_records_bulk(child_id, record_type):
+    """Insert a batch of records of one type in a single transaction"""
+    if record_type not in RECORD_TYPES:
+        return jsonify({"error": f"Unknown record type: {record_type}"}), 404
+    items = request_batch()
+    if items is None:
+        return batch_error()
+    for item in items:
+        if isinstance(item, dict):
+            item.setdefault("type", record_type)
+    return ingest_batch(child_id, items, only=record_type)
+
+
+@records_bp.route("/children/<int:child_id>/bulk", methods=["POST"])
+def add_mixed_records_bulk(child_id):
+    """Insert a batch of records of any type; every item names its own type"""
+    items = request_batch()
+    if items is None:
+        return batch_error()
+    return ingest_batch(child_id, items)
+
+
+def request_batch():
+    """The list of records posted as {"records": [...]}, or None if the body is malformed"""
+    data = request.get_json(silent=True)
+    items = data.get("records") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None
+    if len(items) > current_app.config["MAX_BULK_SIZE"]:
+        return None
+    return items
+
+
+def batch_error():
+    limit = current_app.config["MAX_BULK_SIZE"]
+    return jsonify({"error": f"Expected a non-empty records list of at most {limit} items"}), 400
+
+
+def ingest_batch(child_id, items, only=None):
+    """Validate the whole batch first, then insert it type by type in one transaction.
+
+    With only set, an item naming any other record type is rejected.
+    """
+    Child.query.get_or_404(child_id)
+
+    errors = []
+    groups = {}
+    for index, item in enumerate(items):
+        name = item.get("type") if isinstance(item, dict) else None
+        if name not in RECORD_TYPES:
+            errors.append({"index": index, "error": "Unknown record type"})
+            continue
+        if only is not None and name != only:
+            errors.append({"index": index, "error": f"Expected a {only} record"})
+            continue
+        try:
+            values = prepare_record(RECORD_TYPES[name], item)
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+            continue
+        groups.setdefault(name, []).append((index, values))
+
+    # Nothing is written unless every item is valid
+    if errors:
+        return jsonify({"error": "Invalid records", "errors": errors}), 400
+
+    results = [None] * len(items)
+    for name, group in groups.items():
+        rows = [values for _, values in group]
+        ids = insert_records(RECORD_TYPES[name], child_id, rows)
+        update_summary(RECORD_TYPES[name], child_id, rows)
+        records_created(RECORD_TYPES[name], child_id, [
+            {"id": record_id, "child_id": child_id, **values} for values, record_id in zip(rows, ids)
+        ])
+        for (index, _), record_id in zip(group, ids):
+            results[index] = {"index": index, "type": name, "id": record_id}
+    db.session.commit()
+
+    return jsonify({
+        "status": "success",
+        "message": f"{len(items)} records added",
+        "results": results
+    }), 201
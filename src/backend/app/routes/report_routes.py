@@ -1,169 +1,110 @@
+import hashlib
 from datetime import datetime, timedelta
-from flask import Blueprint, jsonify, request
-from ..models import Child, SleepRecord, FeedingRecord, NappyChangeRecord, MedicationRecord, TemperatureRecord, GrowthRecord
+from flask import Blueprint, abort, current_app, jsonify, request
+from sqlalchemy import select
+from ..extensions import db, report_cache
+from ..serialization import parse_date
+from ..aggregates import BUCKETS, sleep_stats
+from ..reports import build_daily_reports
+from ..models import Child
 
 report_bp = Blueprint('report', __name__)
 
 @report_bp.route('/children/<int:child_id>/daily-report', methods=['GET'])
 def daily_report(child_id):
     """Get all data needed for a child's daily report"""
-    date = request.args.get('date', datetime.now().strftime('%Y-%m-%d'))
+    try:
+        date = parse_date(request.args.get('date', datetime.now().strftime('%Y-%m-%d')))
+    except ValueError:
+        return jsonify({"error": "date must be in YYYY-MM-DD format"}), 400
     
-    # Get child information
-    child = Child.query.get_or_404(child_id)
+    # Serve repeated polls from memory; a matching If-None-Match costs one primary key lookup
+    cached = rendered_reports([child_id], date).get(child_id)
+    if cached is None:
+        abort(404)
     
-    # Get all records for the specified date
-    sleep_records = SleepRecord.query.filter_by(child_id=child_id, sleep_date=date).all()
-    feeding_records = FeedingRecord.query.filter_by(child_id=child_id, feed_date=date).all()
-    nappy_records = NappyChangeRecord.query.filter_by(child_id=child_id, change_date=date).all()
-    medication_records = MedicationRecord.query.filter_by(child_id=child_id, medication_date=date).all()
-    temperature_records = TemperatureRecord.query.filter_by(child_id=child_id, date=date).all()
-    growth_records = GrowthRecord.query.filter_by(child_id=child_id, growth_date=date).all()
-    
-    # Get last week's records for trend analysis
-    last_week = (datetime.strptime(date, '%Y-%m-%d') - timedelta(days=7)).strftime('%Y-%m-%d')
-    
-    # Weekly sleep summary
-    weekly_sleep = SleepRecord.query.filter(
-        SleepRecord.child_id == child_id,
-        SleepRecord.sleep_date >= last_week,
-        SleepRecord.sleep_date <= date
-    ).all()
-    
-    # Calculate sleep stats
-    sleep_stats = {
-        "total_sleep_minutes": 0,
-        "avg_naps_per_day": 0,
-        "days_with_records": set()
-    }
-    
-    for record in weekly_sleep:
-        sleep_stats["days_with_records"].add(record.sleep_date)
-        
-        # Calculate sleep duration
-        start = datetime.strptime(record.start_time, '%H:%M')
-        end = datetime.strptime(record.end_time, '%H:%M')
-        
-        # Handle overnight sleep (if end time is before start time)
-        if end < start:
-            end = end + timedelta(days=1)
-            
-        duration_minutes = (end - start).total_seconds() / 60
-        sleep_stats["total_sleep_minutes"] += duration_minutes
-        
-        if record.sleep_type == "Day time nap":
-            sleep_stats["avg_naps_per_day"] += 1
-    
-    # Calculate averages
-    days_count = len(sleep_stats["days_with_records"]) or 1  # Avoid division by zero
-    sleep_stats["avg_naps_per_day"] = round(sleep_stats["avg_naps_per_day"] / days_count, 1)
-    sleep_stats["avg_sleep_hours"] = round(sleep_stats["total_sleep_minutes"] / days_count / 60, 1)
-    
-    # Clean up the set for JSON serialization
-    sleep_stats.pop("days_with_records")
-    
-    # Today's records summary
-    today_sleep_minutes = sum(
-        (datetime.strptime(record.end_time, '%H:%M') - datetime.strptime(record.start_time, '%H:%M')).total_seconds() / 60
-        for record in sleep_records
-    )
-    
-    today_summary = {
-        "sleep_hours": round(today_sleep_minutes / 60, 1),
-        "naps_count": sum(1 for record in sleep_records if record.sleep_type == "Day time nap"),
-        "feeds_count": len(feeding_records),
-        "nappy_changes": len(nappy_records),
-        "medication_given": len(medication_records) > 0,
-        "temperature_taken": len(temperature_records) > 0
-    }
-    
-    # Format records for the response
-    response = {
-        "child": {
-            "id": child.id,
-            "name": child.name,
-            "sex": child.sex,
-            "date_of_birth": child.date_of_birth,
-            "age_months": calculate_age_months(child.date_of_birth, date)
-        },
-        "date": date,
-        "today_summary": today_summary,
-        "weekly_stats": {
-            "sleep": sleep_stats
-        },
-        "records": {
-            "sleep": [
-                {
-                    "id": record.id,
-                    "sleep_type": record.sleep_type,
-                    "start_time": record.start_time,
-                    "end_time": record.end_time,
-                    "duration_minutes": calculate_duration_minutes(record.start_time, record.end_time)
-                } for record in sleep_records
-            ],
-            "feeding": [
-                {
-                    "id": record.id,
-                    "feed_time": record.feed_time,
-                    "feed_type": record.feed_type,
-                    "food_name": record.food_name,
-                    "feed_amount": record.feed_amount
-                } for record in feeding_records
-            ],
-            "nappy": [
-                {
-                    "id": record.id,
-                    "change_time": record.change_time,
-                    "change_type": record.change_type
-                } for record in nappy_records
-            ],
-            "medication": [
-                {
-                    "id": record.id,
-                    "medication_time": record.medication_time,
-                    "medication_type": record.medication_type,
-                    "dosage": record.dosage
-                } for record in medication_records
-            ],
-            "temperature": [
-                {
-                    "id": record.id,
-                    "temperature_time": record.temperature_time,
-                    "temperature": record.temperature
-                } for record in temperature_records
-            ],
-            "growth": [
-                {
-                    "id": record.id,
-                    "weight": record.weight,
-                    "height": record.height
-                } for record in growth_records
-            ]
-        }
-    }
-    
-    return jsonify(response)
+    etag, body = cached
+    return conditional_json(etag, body)
 
-def calculate_age_months(birth_date_str, current_date_str):
-    """Calculate age in months from birth date to current date"""
-    birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d')
-    current_date = datetime.strptime(current_date_str, '%Y-%m-%d')
-    
-    months = (current_date.year - birth_date.year) * 12 + (current_date.month - birth_date.month)
-    
-    # Adjust for day of month
-    if current_date.day < birth_date.day:
-        months -= 1
-        
-    return months
+@report_bp.route('/daily-report', methods=['GET'])
+def daily_reports():
+    """Daily reports of several children (say, a daycare room) in one response, with a fixed number of queries"""
+    try:
+        date = parse_date(request.args.get('date', datetime.now().strftime('%Y-%m-%d')))
+    except ValueError:
+        return jsonify({"error": "date must be in YYYY-MM-DD format"}), 400
+
+    limit = current_app.config["MAX_REPORT_CHILDREN"]
+    try:
+        child_ids = list(dict.fromkeys(int(value) for value in request.args.get('child_ids', '').split(',')))
+    except ValueError:
+        child_ids = []
+    if not child_ids or len(child_ids) > limit:
+        return jsonify({"error": f"child_ids must be a comma-separated list of at most {limit} ids"}), 400
+
+    # Splice the cached per-child bodies together rather than serializing the reports again
+    rendered = rendered_reports(child_ids, date)
+    not_found = [child_id for child_id in child_ids if child_id not in rendered]
+    results = b",".join(b'"%d":%s' % (child_id, rendered[child_id][1]) for child_id in child_ids if child_id in rendered)
+    body = b'{"not_found":%s,"results":{%s},"status":"success"}' % (current_app.json.dumps(not_found).encode(), results)
+    return conditional_json(hashlib.sha1(body).hexdigest(), body)
+
+@report_bp.route('/report-cache', methods=['GET'])
+def report_cache_stats():
+    """Hit and miss counters of this worker's daily report cache"""
+    return jsonify({"status": "success", "results": report_cache.stats()})
 
-def calculate_duration_minutes(start_time_str, end_time_str):
-    """Calculate duration in minutes between two time strings"""
-    start_time = datetime.strptime(start_time_str, '%H:%M')
-    end_time = datetime.strptime(end_time_str, '%H:%M')
+def rendered_reports(child_ids, date):
+    """(etag, JSON body) of each existing child's report, from the cache or built together in one batch"""
+    # Read before building, so a report racing a write is cached under the older version
+    versions = dict(db.session.execute(
+        select(Child.id, Child.data_version).where(Child.id.in_(child_ids))
+    ).all())
+    rendered = {}
+    missing = []
+    for child_id in child_ids:
+        if child_id not in versions:
+            continue
+        cached = report_cache.get((child_id, date), versions[child_id])
+        if cached is None:
+            missing.append(child_id)
+        else:
+            rendered[child_id] = cached
+
+    if missing:
+        for child_id, report in build_daily_reports(missing, date).items():
+            body = current_app.json.dumps(report).encode()
+            rendered[child_id] = (hashlib.sha1(body).hexdigest(), body)
+            report_cache.set((child_id, date), rendered[child_id], versions[child_id])
+    return rendered
+
+def conditional_json(etag, body):
+    response = current_app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@report_bp.route('/children/<int:child_id>/sleep-stats', methods=['GET'])
+def get_sleep_stats(child_id):
+    """Sleep totals and averages over any window, optionally split into day, week or month buckets"""
+    bucket = request.args.get('bucket')
+    if bucket is not None and bucket not in BUCKETS:
+        return jsonify({"error": f"bucket must be one of {', '.join(BUCKETS)}"}), 400
+
+    try:
+        date_to = parse_date(request.args.get('to', datetime.now().strftime('%Y-%m-%d')))
+        date_from = parse_date(request.args['from']) if 'from' in request.args else date_to - timedelta(days=7)
+    except ValueError:
+        return jsonify({"error": "from and to must be dates in YYYY-MM-DD format"}), 400
+
+    Child.query.get_or_404(child_id)
     
-    # Handle overnight sleep (if end time is before start time)
-    if end_time < start_time:
-        end_time = end_time + timedelta(days=1)
-        
-    return round((end_time - start_time).total_seconds() / 60) 
\ No newline at end of file
+    results = {
+        "from": date_from,
+        "to": date_to,
+        "bucket": bucket,
+        "totals": sleep_stats(child_id, date_from, date_to)
+    }
+    if bucket:
+        results["buckets"] = sleep_stats(child_id, date_from, date_to, bucket)
+    return jsonify({"status": "success", "results": results})
@@ -0,0 +1,43 @@
+from flask import Blueprint, current_app, jsonify, request
+from ..models import Child
+from ..search import SEARCHABLE, match_expression, search_records, suggestions
+
+search_bp = Blueprint("search", __name__)
+
+
+def search_args(default_limit):
+    """The q and limit parameters; raises ValueError when they can't be used"""
+    query = request.args.get("q", "")
+    if match_expression(query) is None:
+        raise ValueError("q must contain at least one word")
+    limit = request.args.get("limit", default_limit, type=int)
+    if limit is None or limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return query, min(limit, current_app.config["MAX_PAGE_SIZE"])
+
+
+@search_bp.route("/children/<int:child_id>/search", methods=["GET"])
+def search(child_id):
+    """The child's feeds and medications whose food or medication name matches q, best matches first"""
+    try:
+        query, limit = search_args(50)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    Child.query.get_or_404(child_id)
+    return jsonify({"status": "success", "results": search_records(child_id, query, limit)})
+
+
+@search_bp.route("/children/<int:child_id>/search/suggestions", methods=["GET"])
+def get_suggestions(child_id):
+    """Autocomplete values for a form field: names the child's earlier records used, most used first"""
+    name = request.args.get("type")
+    if name not in SEARCHABLE:
+        return jsonify({"error": f"type must be one of {', '.join(SEARCHABLE)}"}), 400
+    # Nothing typed yet is not an error here, there is just nothing to complete
+    if match_expression(request.args.get("q")) is None:
+        return jsonify({"status": "success", "results": []})
+    try:
+        query, limit = search_args(10)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"status": "success", "results": suggestions(child_id, name, query, limit)})
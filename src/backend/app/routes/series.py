@@ -0,0 +1,31 @@
+from flask import Blueprint, current_app, jsonify, request
+from ..models import Child
+from ..records import parse_date_arg
+from ..series import METRICS, build_series
+
+series_bp = Blueprint("series", __name__)
+
+
+@series_bp.route("/children/<int:child_id>/series/<metric>", methods=["GET"])
+def get_series(child_id, metric):
+    """Chart-ready series of one metric, bucketed by day or hour and optionally downsampled"""
+    if metric not in METRICS:
+        return jsonify({"error": f"metric must be one of {', '.join(METRICS)}"}), 404
+    metric_spec = METRICS[metric]
+
+    bucket = request.args.get("bucket")
+    if bucket is not None and bucket not in metric_spec.buckets:
+        return jsonify({"error": f"bucket must be one of {', '.join(metric_spec.buckets)}"}), 400
+    try:
+        date_from = parse_date_arg(request.args.get("from"), "from")
+        date_to = parse_date_arg(request.args.get("to"), "to")
+        points = request.args.get("points", type=int)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if "points" in request.args and (points is None or points < 3):
+        return jsonify({"error": "points must be an integer of at least 3"}), 400
+    points = min(points, current_app.config["MAX_PAGE_SIZE"]) if points else None
+
+    Child.query.get_or_404(child_id)
+    results = build_series(metric_spec, child_id, date_from, date_to, bucket, points)
+    return jsonify({"status": "success", "results": dict(results, metric=metric)})
@@ -0,0 +1,88 @@
+"""Read/write splitting: GET requests read through a separate read-only engine.
+
+The read engine is the "replica" bind: either READ_REPLICA_URL, or with the value
+"readonly" a second connection pool on the primary SQLite file opened with mode=ro.
+Only the SELECTs of GET and HEAD requests go there: plain selects, UNIONs, and textual
+SQL that declares its result columns (text().columns()). Bare text() can't be told apart
+from DML, so it stays on the primary, as does anything a flush touches. A client's reads
+within READ_YOUR_WRITES_SECONDS of its last write also stay on the primary, so a caregiver
+sees their own entry even when the replica lags. Every write answers with its time in an
+X-Last-Write header that the client sends back on its following requests, so the rule
+holds whichever worker process serves them, also for a frontend on another origin.
+"""
+import time
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import make_url
+
+REPLICA = "replica"
+# Header carrying the time of the client's last write, out in write responses and back in requests
+LAST_WRITE_HEADER = "X-Last-Write"
+
+
+def read_only_url(url):
+    """The primary's SQLite file opened read-only; flask-sqlalchemy resolves relative paths for both"""
+    url = make_url(url)
+    if not url.drivername.startswith("sqlite") or url.database in (None, "", ":memory:"):
+        raise ValueError("READ_REPLICA_URL=readonly needs a file-based SQLite database")
+    database = url.database if url.query.get("uri") else f"file:{url.database}"
+    return url.set(database=database).update_query_dict({"mode": "ro", "uri": "true"})
+
+
+class RoutingSession(Session):
+    """Session that sends the SELECTs of read requests to the replica bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and getattr(clause, "is_select", False)
+                and has_app_context() and g.get("read_replica")):
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadRouter:
+    def __init__(self):
+        self.enabled = False
+        self.window = 0
+
+    def configure(self, app):
+        """Add the replica bind to the config; must run before db.init_app"""
+        url = app.config.get("READ_REPLICA_URL")
+        self.enabled = bool(url)
+        if not url:
+            return
+        if url == "readonly":
+            url = read_only_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        app.config["SQLALCHEMY_BINDS"] = dict(app.config.get("SQLALCHEMY_BINDS") or {}, **{REPLICA: url})
+
+    def init_app(self, app):
+        """Route the app's reads; must run after db.init_app"""
+        from .extensions import db
+
+        # The replica bind has no tables of its own. Dropping its metadata keeps create_all
+        # on the primary, also for later apps of this process that have no replica.
+        db.metadatas.pop(REPLICA, None)
+        self.window = app.config["READ_YOUR_WRITES_SECONDS"]
+        if self.enabled:
+            app.before_request(self.route_request)
+            app.after_request(self.remember_write)
+            app.extensions["read_router"] = self
+
+    def route_request(self):
+        if request.method in ("GET", "HEAD"):
+            g.read_replica = not self.recently_written()
+
+    def recently_written(self):
+        try:
+            written = float(request.headers.get(LAST_WRITE_HEADER, ""))
+        except ValueError:
+            return False
+        return time.time() - written < self.window
+
+    def remember_write(self, response):
+        """Stamp the time of a successful write on the client, for its following reads"""
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400 and self.window > 0:
+            response.headers[LAST_WRITE_HEADER] = f"{time.time():.3f}"
+        return response
+
+
+read_router = ReadRouter()
@@ -0,0 +1,160 @@
+"""Full-text search over the free-text record fields, on an SQLite FTS5 index.
+
+One FTS5 table indexes every searchable field. Triggers on the record tables keep it in
+step with every write path (single and bulk creates, group commit, deletes and the
+ON DELETE CASCADE of a purged child). An entry's rowid encodes the record type and id,
+so a trigger finds its entry without scanning. child_id is an indexed column matched as
+part of every query, so a search reads only the child's entries. Rows moved to the archive stay searchable:
+the archival job puts their entries back after the hot-table triggers removed them.
+"""
+import re
+from sqlalchemy import Integer, String, event, select, text
+from .extensions import db
+from .records import RECORD_TYPES, record_tables
+
+TABLE = "record_search"
+
+# Record type -> the free-text field indexed for it; the position is part of each entry's rowid
+SEARCHABLE = {
+    "feed": "food_name",
+    "medication": "medication_type",
+}
+
+
+def entry_rowid(name, id_expression):
+    return f"{id_expression} * {len(SEARCHABLE)} + {list(SEARCHABLE).index(name)}"
+
+
+def index_statements():
+    """DDL creating the index and its triggers; safe to run again"""
+    statements = [
+        # unicode61 folds case and accents; the prefix indexes serve search-as-you-type
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+        "text, record_type UNINDEXED, child_id, record_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    ]
+    for name, field in SEARCHABLE.items():
+        table = RECORD_TYPES[name].model.__tablename__
+        add = (
+            f"INSERT INTO {TABLE} (rowid, text, record_type, child_id, record_id) "
+            f"SELECT {entry_rowid(name, 'new.id')}, new.{field}, '{name}', new.child_id, new.id "
+            f"WHERE new.{field} IS NOT NULL AND new.{field} != '';"
+        )
+        remove = f"DELETE FROM {TABLE} WHERE rowid = {entry_rowid(name, 'old.id')};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_insert AFTER INSERT ON {table} BEGIN {add} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_delete AFTER DELETE ON {table} BEGIN {remove} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF {field}, child_id ON {table} "
+            f"BEGIN {remove} {add} END",
+        ]
+    return statements
+
+
+def index_outdated(connection):
+    """True if the stored index predates the indexed child_id column and has to be rebuilt"""
+    sql = connection.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = ?", (TABLE,)).scalar()
+    return sql is not None and "child_id UNINDEXED" in sql
+
+
+def ensure_index(connection):
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in index_statements():
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(db.metadata, "after_create")
+def create_index(target, connection, **kw):
+    ensure_index(connection)
+
+
+@event.listens_for(db.metadata, "before_drop")
+def drop_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {TABLE}")
+
+
+def index_missing(name, table=None):
+    """Add the entries missing for the rows of a record table; None stands for the hot table,
+    otherwise an archive table whose rows lost their entries when they left the hot one"""
+    field = SEARCHABLE[name]
+    source = RECORD_TYPES[name].model.__tablename__ if table is None else f"{table.schema}.{table.name}"
+    rowid = entry_rowid(name, "id")
+    return db.session.execute(text(
+        f"INSERT INTO {TABLE} (rowid, text, record_type, child_id, record_id) "
+        f"SELECT {rowid}, {field}, :name, child_id, id FROM {source} "
+        f"WHERE {field} IS NOT NULL AND {field} != '' "
+        f"AND NOT EXISTS (SELECT 1 FROM {TABLE} WHERE rowid = {rowid})"
+    ), {"name": name}).rowcount
+
+
+def remove_entry(name, record_id):
+    """Take a record out of the index; only needed for archived rows, which have no triggers"""
+    db.session.execute(text(f"DELETE FROM {TABLE} WHERE rowid = {entry_rowid(name, ':id')}"), {"id": record_id})
+
+
+def remove_children(child_ids):
+    child_ids = list(child_ids)
+    if child_ids:
+        db.session.execute(text(f"DELETE FROM {TABLE} WHERE {TABLE} MATCH :match"), {"match": child_filter(child_ids)})
+
+
+def rebuild_index(echo=print):
+    """Fill the index from scratch, archived records included"""
+    db.session.execute(text(f"DELETE FROM {TABLE}"))
+    for name in SEARCHABLE:
+        indexed = sum(index_missing(name, table) for table in record_tables(RECORD_TYPES[name]))
+        echo(f"{RECORD_TYPES[name].label}: {indexed} records indexed for search")
+    db.session.commit()
+
+
+def match_expression(query):
+    """FTS5 query requiring every word of the input, each as a prefix; None if there are no words"""
+    words = re.findall(r"\w+", query or "")
+    if not words:
+        return None
+    # Quoting keeps words like AND or NEAR from being read as FTS5 operators
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def child_filter(child_ids):
+    """FTS5 query matching the entries of any of the children, through the index on child_id"""
+    terms = [f'"{int(child_id)}"' for child_id in child_ids]
+    return f"child_id : ({' OR '.join(terms)})"
+
+
+def child_match(child_id, query):
+    """FTS5 query for the child's entries whose text matches the query"""
+    return f"{child_filter([child_id])} AND text : ({match_expression(query)})"
+
+
+def search_records(child_id, query, limit):
+    """A child's records whose text matches the query, best matches first, as {"type", **record} dicts"""
+    # Declaring the result columns marks the text as a SELECT, which GET requests read from the replica
+    hits = db.session.execute(text(
+        f"SELECT record_type, record_id FROM {TABLE} "
+        f"WHERE {TABLE} MATCH :query ORDER BY rank LIMIT :limit"
+    ).columns(record_type=String, record_id=Integer), {"query": child_match(child_id, query), "limit": limit}).all()
+
+    ids = {}
+    for name, record_id in hits:
+        ids.setdefault(name, []).append(record_id)
+    records = {}
+    for name, record_ids in ids.items():
+        record_type = RECORD_TYPES[name]
+        for table in record_tables(record_type):
+            source = record_type.model if table is None else table.c
+            rows = db.session.execute(
+                select(*record_type.columns(table=table)).where(source.child_id == child_id, source.id.in_(record_ids))
+            )
+            for record in record_type.to_dicts(rows):
+                records[name, record["id"]] = {"type": name, **record}
+    return [records[hit] for hit in map(tuple, hits) if hit in records]
+
+
+def suggestions(child_id, name, query, limit):
+    """Distinct values of a type's field, most used first, among the child's records matching the query"""
+    return db.session.scalars(text(
+        f"SELECT text FROM {TABLE} WHERE {TABLE} MATCH :query AND record_type = :name "
+        f"GROUP BY text ORDER BY count(*) DESC, text LIMIT :limit"
+    ).columns(text=String), {"query": child_match(child_id, query), "name": name, "limit": limit}).all()
@@ -0,0 +1,100 @@
+"""Synthetic multi-year histories for load testing and benchmarks."""
+import random
+from datetime import date, time, timedelta
+from sqlalchemy import insert
+from .extensions import db
+from .models import Child
+from .records import RECORD_TYPES
+from .summary import rebuild_summaries
+
+FOODS = ["Milk", "Banana", "Apple puree", "Porridge", "Carrot", "Rice", "Yoghurt", "Pear"]
+MEDICATIONS = ["Paracetamol", "Ibuprofen", "Vitamin D", "Amoxicillin"]
+
+
+def clock(rng, start_hour, end_hour):
+    return time(rng.randrange(start_hour, end_hour), rng.randrange(60))
+
+
+def child_day(rng, day, feeds_per_day, nappies_per_day, naps_per_day):
+    """Yield (type name, values) for one plausible day of a child's life"""
+    yield "sleep", {
+        "sleep_date": day, "sleep_type": "Night time sleep",
+        "start_time": clock(rng, 18, 22), "end_time": clock(rng, 5, 8),
+    }
+    for nap in range(rng.randint(max(naps_per_day - 1, 0), naps_per_day + 1)):
+        start = clock(rng, min(9 + nap * 3, 21), min(11 + nap * 3, 22))
+        yield "sleep", {
+            "sleep_date": day, "sleep_type": "Day time nap",
+            "start_time": start, "end_time": time(start.hour + 1, rng.randrange(60)),
+        }
+    for _ in range(rng.randint(max(feeds_per_day - 1, 0), feeds_per_day + 1)):
+        liquid = rng.random() < 0.6
+        yield "feed", {
+            "feed_date": day, "feed_time": clock(rng, 6, 20),
+            "feed_type": "Liquid" if liquid else "Solid",
+            "food_name": "Milk" if liquid else rng.choice(FOODS),
+            "feed_amount": str(rng.randrange(60, 240, 10)) if liquid else "Half a bowl",
+        }
+    for _ in range(rng.randint(max(nappies_per_day - 1, 0), nappies_per_day + 1)):
+        yield "nappy", {
+            "change_date": day, "change_time": clock(rng, 0, 24),
+            "change_type": rng.choice(["Wet", "Dirty", "Mixed"]),
+        }
+    if rng.random() < 0.1:
+        for _ in range(rng.randint(1, 3)):
+            yield "temperature", {
+                "date": day, "temperature_time": clock(rng, 0, 24),
+                "temperature": round(rng.gauss(37.2, 0.5), 1),
+            }
+    if rng.random() < 0.05:
+        yield "medication", {
+            "medication_date": day, "medication_time": clock(rng, 0, 24),
+            "medication_type": rng.choice(MEDICATIONS), "dosage": f"{rng.choice([2.5, 5, 7.5])}ml",
+        }
+
+
+def seed_database(children=10, days=730, seed=0, feeds_per_day=7, nappies_per_day=6,
+                  naps_per_day=2, end_date=None, batch_size=5000, echo=print):
+    """Add children with `days` of history each; returns the ids of the new children"""
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+    child_ids = []
+
+    for number in range(children):
+        child = Child(
+            name=f"Child {number + 1}",
+            sex=rng.choice(["Male", "Female"]),
+            date_of_birth=start_date - timedelta(days=rng.randrange(0, 60)),
+        )
+        db.session.add(child)
+        db.session.flush()
+
+        # Monthly growth with a gently rising curve
+        weight, height = rng.uniform(3.0, 4.0), rng.uniform(48.0, 54.0)
+        pending = {name: [] for name in RECORD_TYPES}
+        count = 0
+        for offset in range(days):
+            day = start_date + timedelta(days=offset)
+            for name, values in child_day(rng, day, feeds_per_day, nappies_per_day, naps_per_day):
+                pending[name].append(dict(values, child_id=child.id))
+            if offset % 30 == 0:
+                weight += rng.uniform(0.1, 0.6)
+                height += rng.uniform(0.5, 2.0)
+                pending["growth"].append({
+                    "child_id": child.id, "growth_date": day,
+                    "weight": round(weight, 2), "height": round(height, 1),
+                })
+            if sum(len(rows) for rows in pending.values()) >= batch_size or offset == days - 1:
+                for name, rows in pending.items():
+                    if rows:
+                        db.session.execute(insert(RECORD_TYPES[name].model), rows)
+                        count += len(rows)
+                        rows.clear()
+        db.session.commit()
+        child_ids.append(child.id)
+        echo(f"Child {child.id}: {count} records over {days} days")
+
+    for child_id in child_ids:
+        rebuild_summaries(child_id=child_id, echo=lambda message: None)
+    return child_ids
@@ -0,0 +1,67 @@
+import math
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+from .extensions import db
+
+# Wire formats shared with the Vue frontend
+DATE_FORMAT = '%Y-%m-%d'
+TIME_FORMAT = '%H:%M'
+
+
+def parse_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def parse_time(value):
+    """Accept HH:MM as sent by the frontend, and HH:MM:SS for older clients"""
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def parse_float(value):
+    if isinstance(value, bool):
+        raise ValueError("Expected a number")
+    number = float(value)
+    # inf and nan would be stored, then sent back as Infinity/NaN, which isn't valid JSON
+    if not math.isfinite(number):
+        raise ValueError("Expected a finite number")
+    return number
+
+
+def parse_value(column, value):
+    """Convert an incoming JSON value to the Python type of the given column"""
+    if value is None or value == "":
+        return None
+    if isinstance(column.type, db.DateTime):
+        return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if isinstance(column.type, db.Date):
+        return parse_date(value)
+    if isinstance(column.type, db.Time):
+        return parse_time(value)
+    if isinstance(column.type, db.Float):
+        return parse_float(value)
+    return value
+
+
+def format_value(value):
+    """Render a column value the way the JSON API has always shown it"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.strftime(DATE_FORMAT)
+    if isinstance(value, time):
+        return value.strftime(TIME_FORMAT)
+    return value
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Serialize dates and times as plain strings instead of Flask's HTTP date format"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (date, time)):
+            return format_value(o)
+        return DefaultJSONProvider.default(o)
@@ -0,0 +1,180 @@
+"""Chart-ready time series computed by the database, with optional LTTB downsampling."""
+from datetime import datetime, time
+from sqlalchemy import Float, Integer, cast, func, select
+from .extensions import db
+from .records import RECORD_TYPES, select_records
+from .aggregates import sleep_minutes
+
+BUCKET_LABELS = {
+    "day": lambda key: key[0].isoformat(),
+    "hour": lambda key: f"{key[0].isoformat()}T{key[1]:02d}:00",
+}
+
+
+class Metric:
+    """One chartable metric: which record type it reads and how it is aggregated per bucket.
+
+    values maps series names to functions building the aggregate expression from the
+    record columns. With a category field every category value gets its own series,
+    named after the value (plus the series name when there is more than one value).
+    Metrics with a raw field can also be charted record by record; the first bucket
+    listed is the default.
+    """
+
+    def __init__(self, record_type, values, buckets, category=None, raw=None):
+        self.record_type = RECORD_TYPES[record_type]
+        self.values = values
+        self.buckets = buckets
+        self.category = category
+        self.raw = raw
+
+
+METRICS = {
+    "sleep": Metric("sleep", {
+        "hours": lambda c: func.round(func.sum(sleep_minutes(c)) / 60.0, 2),
+    }, buckets=["day"], category="sleep_type"),
+    "feed": Metric("feed", {
+        "feeds": lambda c: func.count(),
+        "amount": lambda c: func.sum(cast(c.feed_amount, Float)),
+    }, buckets=["day", "hour"], category="feed_type"),
+    "nappy": Metric("nappy", {
+        "changes": lambda c: func.count(),
+    }, buckets=["day", "hour"], category="change_type"),
+    "temperature": Metric("temperature", {
+        "average": lambda c: func.round(func.avg(c.temperature), 2),
+        "max": lambda c: func.max(c.temperature),
+    }, buckets=["raw", "hour", "day"], raw="temperature"),
+    "weight": Metric("growth", {}, buckets=["raw"], raw="weight"),
+    "height": Metric("growth", {}, buckets=["raw"], raw="height"),
+}
+
+
+def records(metric, child_id, date_from, date_to):
+    """The child's records of the metric's type in the date range, hot and archived, as a subquery"""
+    return select_records(metric.record_type, child_id, date_from, date_to).subquery()
+
+
+def bucket_columns(record_type, bucket, c):
+    if bucket == "hour":
+        return [c[record_type.date_field], cast(func.strftime("%H", c[record_type.time_field]), Integer)]
+    return [c[record_type.date_field]]
+
+
+def bucket_filter(record_type, bucket, c):
+    # Records without a time (temperatures may lack one) belong to no hour
+    if bucket == "hour":
+        return [c[record_type.time_field].is_not(None)]
+    return []
+
+
+def raw_series(metric, child_id, date_from, date_to):
+    """Every record as its own point, in time order"""
+    record_type = metric.record_type
+    source = records(metric, child_id, date_from, date_to)
+    c = source.c
+    columns = [c[record_type.date_field]] + ([c[record_type.time_field]] if record_type.time_field else [])
+    query = select(*columns, c[metric.raw]).order_by(*record_type.order_columns(source))
+    x, values = [], []
+    for row in db.session.execute(query):
+        moment = datetime.combine(row[0], row[1] or time()) if record_type.time_field else row[0]
+        x.append(moment)
+        values.append(row[-1])
+    return x, {metric.raw: values}
+
+
+def bucketed_series(metric, child_id, date_from, date_to, bucket):
+    """One point per day or hour that has records, each series aligned with x"""
+    record_type = metric.record_type
+    c = records(metric, child_id, date_from, date_to).c
+    keys = bucket_columns(record_type, bucket, c)
+    values = metric.values
+    categories = [c[metric.category]] if metric.category is not None else []
+    query = (
+        select(*keys, *categories, *[value(c).label(name) for name, value in values.items()])
+        .where(*bucket_filter(record_type, bucket, c))
+        .group_by(*keys, *categories)
+        .order_by(*keys)
+    )
+
+    x, series = [], {}
+    for row in db.session.execute(query):
+        key = tuple(row[:len(keys)])
+        if not x or x[-1] != key:
+            x.append(key)
+        for offset, name in enumerate(values):
+            value = row[len(keys) + len(categories) + offset]
+            if categories:
+                category = row[len(keys)]
+                name = category if len(values) == 1 else f"{category} {name}"
+            points = series.setdefault(name, {})
+            points[len(x) - 1] = value
+    # Buckets where a category has no records get 0 (counts) rather than a gap
+    return x, {name: [points.get(index, 0) for index in range(len(x))] for name, points in series.items()}
+
+
+def build_series(metric, child_id, date_from=None, date_to=None, bucket=None, points=None):
+    """The series of one metric, downsampled to at most `points` points when given"""
+    bucket = bucket or metric.buckets[0]
+    if bucket == "raw":
+        x, series = raw_series(metric, child_id, date_from, date_to)
+        labels = [moment.isoformat(timespec="minutes") if isinstance(moment, datetime) else moment.isoformat()
+                  for moment in x]
+        positions = [as_days(moment) for moment in x]
+    else:
+        x, series = bucketed_series(metric, child_id, date_from, date_to, bucket)
+        labels = [BUCKET_LABELS[bucket](key) for key in x]
+        positions = [as_days(key[0]) + (key[1] / 24 if len(key) > 1 else 0) for key in x]
+
+    total = len(labels)
+    if points and total > points:
+        # Pick points by the shape of the combined series so all series keep the same x
+        combined = [sum(values[index] or 0 for values in series.values()) for index in range(total)]
+        keep = lttb(positions, combined, points)
+        labels = [labels[index] for index in keep]
+        series = {name: [values[index] for index in keep] for name, values in series.items()}
+
+    return {"bucket": bucket, "x": labels, "series": series, "total_points": total}
+
+
+def as_days(moment):
+    """Position on a numeric time axis, in days"""
+    if isinstance(moment, datetime):
+        return moment.toordinal() + (moment.hour * 60 + moment.minute) / 1440
+    return moment.toordinal()
+
+
+def lttb(xs, ys, threshold):
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between keeps the
+    point forming the largest triangle with the previously kept point and the
+    average of the next bucket, which preserves peaks and the overall shape.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    kept = [0]
+    size = (count - 2) / (threshold - 2)
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * size) + 1
+        end = int((bucket + 1) * size) + 1
+        # Average of the following bucket (the last point for the final bucket)
+        next_start, next_end = end, min(int((bucket + 2) * size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        span = next_end - next_start
+        average_x = sum(xs[next_start:next_end]) / span
+        average_y = sum(ys[next_start:next_end]) / span
+
+        best, best_area = start, -1.0
+        ax, ay = xs[previous], ys[previous]
+        for index in range(start, min(end, count - 1)):
+            area = abs((ax - average_x) * (ys[index] - ay) - (ax - xs[index]) * (average_y - ay))
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        previous = best
+    kept.append(count - 1)
+    return kept
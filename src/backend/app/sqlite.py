@@ -0,0 +1,26 @@
+from sqlalchemy import event
+from .extensions import db
+
+
+def init_app(app):
+    """Apply the configured PRAGMAs to every connection the app's SQLite engines open"""
+    pragmas = app.config.get("SQLITE_PRAGMAS")
+    if not pragmas:
+        return
+
+    # A read-only connection can't switch the journal mode; it follows what the primary set
+    read_only_pragmas = {name: value for name, value in pragmas.items() if name != "journal_mode"}
+
+    def pragma_setter(pragmas):
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+        return set_pragmas
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == "sqlite":
+                read_only = engine.url.query.get("mode") == "ro"
+                event.listen(engine, "connect", pragma_setter(read_only_pragmas if read_only else pragmas))
@@ -0,0 +1,99 @@
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from .extensions import db
+from .models import Child, DailySummary
+from .records import RECORD_TYPES, select_records
+from .changes import mark_changed
+
+COUNTERS = [
+    "sleep_count", "naps_count", "sleep_minutes", "feeds_count",
+    "nappy_changes", "medication_count", "temperature_count",
+]
+
+# Upserts keep concurrent writers from racing to create the same (child, date) row
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def calculate_duration_minutes(start_time, end_time):
+    """Calculate duration in minutes between two times of day"""
+    start_minutes = start_time.hour * 60 + start_time.minute
+    end_minutes = end_time.hour * 60 + end_time.minute
+
+    # Handle overnight sleep (if end time is before start time)
+    if end_minutes < start_minutes:
+        end_minutes += 24 * 60
+
+    return end_minutes - start_minutes
+
+
+def contribution(record_type, values):
+    """How much one record adds to the counters of its day"""
+    name = record_type.name
+    if name == "sleep":
+        return {
+            "sleep_count": 1,
+            "naps_count": 1 if values["sleep_type"] == "Day time nap" else 0,
+            "sleep_minutes": calculate_duration_minutes(values["start_time"], values["end_time"]),
+        }
+    if name == "feed":
+        return {"feeds_count": 1}
+    if name == "nappy":
+        return {"nappy_changes": 1}
+    if name == "medication":
+        return {"medication_count": 1}
+    if name == "temperature":
+        return {"temperature_count": 1}
+    # Growth measurements are not part of the daily summary
+    return {}
+
+
+def accumulate(totals, record_type, values, sign=1):
+    """Add one record's contribution to a {date: counters} dict"""
+    counters = contribution(record_type, values)
+    if not counters:
+        return
+    day = totals.setdefault(values[record_type.date_field], dict.fromkeys(COUNTERS, 0))
+    for key, amount in counters.items():
+        day[key] += sign * amount
+
+
+def update_summary(record_type, child_id, rows, sign=1):
+    """Apply created (sign=1) or deleted (sign=-1) records to the summary in the current transaction.
+
+    Every record write goes through here, so it also marks the child's cached reports as stale.
+    """
+    mark_changed(child_id)
+    totals = {}
+    for values in rows:
+        accumulate(totals, record_type, values, sign)
+    if not totals:
+        return
+
+    insert = UPSERT_DIALECTS[db.session.get_bind().dialect.name]
+    statement = insert(DailySummary)
+    statement = statement.on_conflict_do_update(
+        index_elements=[DailySummary.child_id, DailySummary.date],
+        set_={key: getattr(DailySummary, key) + statement.excluded[key] for key in COUNTERS}
+    )
+    db.session.execute(statement, [
+        dict(counters, child_id=child_id, date=day) for day, counters in totals.items()
+    ])
+
+
+def rebuild_summaries(child_id=None, echo=print):
+    """Recompute the summary from the record tables, one child per transaction"""
+    child_ids = [child_id] if child_id else db.session.scalars(select(Child.id).order_by(Child.id)).all()
+    for current_id in child_ids:
+        totals = {}
+        for record_type in RECORD_TYPES.values():
+            query = select_records(record_type, current_id)
+            for row in db.session.execute(query.execution_options(yield_per=1000)):
+                accumulate(totals, record_type, row._mapping)
+
+        db.session.execute(delete(DailySummary).where(DailySummary.child_id == current_id))
+        if totals:
+            db.session.execute(DailySummary.__table__.insert(), [
+                dict(counters, child_id=current_id, date=day) for day, counters in totals.items()
+            ])
+        db.session.commit()
+        echo(f"Child {current_id}: {len(totals)} days summarised")
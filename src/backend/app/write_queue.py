@@ -0,0 +1,137 @@
+"""Group commit: record creates from many requests share one transaction and one fsync.
+
+With GROUP_COMMIT_ENABLED the record blueprints hand prepared rows to a bounded queue
+instead of committing themselves. A single writer thread drains it, inserting whatever
+arrived within GROUP_COMMIT_DELAY_MS (or GROUP_COMMIT_MAX_ROWS rows) in one transaction,
+and resolves each request's future with the id of its row.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from .extensions import db
+from .records import insert_records
+from .changes import records_created
+from .summary import update_summary
+
+
+class QueueFull(Exception):
+    """The write queue is at capacity; the client should retry later"""
+
+
+class GroupCommitQueue:
+    def __init__(self):
+        self.app = None
+        self._queue = None
+        self._writer = None
+        self._start_lock = threading.Lock()
+
+    def init_app(self, app):
+        self._queue = self._writer = None
+        if not app.config["GROUP_COMMIT_ENABLED"]:
+            return
+        self.app = app
+        self.max_rows = app.config["GROUP_COMMIT_MAX_ROWS"]
+        self.delay = app.config["GROUP_COMMIT_DELAY_MS"] / 1000
+        self.timeout = app.config["GROUP_COMMIT_TIMEOUT"]
+        self._queue = queue.Queue(maxsize=app.config["GROUP_COMMIT_QUEUE_SIZE"])
+        app.extensions["write_queue"] = self
+
+    @property
+    def enabled(self):
+        return self._queue is not None
+
+    def _ensure_writer(self):
+        # Started on first use rather than in init_app, so forking servers get it in each worker
+        if self._writer is None or not self._writer.is_alive():
+            with self._start_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(
+                        target=self._run, args=(self.app, self._queue), name="group-commit", daemon=True
+                    )
+                    self._writer.start()
+
+    def submit(self, record_type, child_id, values):
+        """Queue one prepared record and return the future of its id; raises QueueFull"""
+        self._ensure_writer()
+        future = Future()
+        try:
+            self._queue.put_nowait((record_type, child_id, values, future))
+        except queue.Full:
+            raise QueueFull()
+        return future
+
+    def insert(self, record_type, child_id, values):
+        """Queue one record and wait for the id it was committed with.
+
+        Raises TimeoutError after GROUP_COMMIT_TIMEOUT, with the record withdrawn from the
+        queue, so a client retrying the request can't create it twice.
+        """
+        future = self.submit(record_type, child_id, values)
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise
+            # The writer already took the row; its transaction decides
+            return future.result()
+
+    def _run(self, app, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.delay
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            # Rows whose request timed out were cancelled and are dropped; the rest can't be anymore
+            batch = [item for item in batch if item[3].set_running_or_notify_cancel()]
+            if batch:
+                with app.app_context():
+                    self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            ids = self._write(batch)
+        except Exception:
+            db.session.rollback()
+        else:
+            for (_, _, _, future), record_id in zip(batch, ids):
+                future.set_result(record_id)
+            return
+
+        # Commit one by one so a single failing row (say, a child deleted meanwhile) only fails its own request
+        for item in batch:
+            try:
+                record_id, = self._write([item])
+            except Exception as e:
+                db.session.rollback()
+                item[3].set_exception(e)
+            else:
+                item[3].set_result(record_id)
+
+    def _write(self, batch):
+        """Insert a batch in one transaction, grouped by type and child; returns the ids in batch order"""
+        groups = {}
+        for position, (record_type, child_id, values, _) in enumerate(batch):
+            groups.setdefault((record_type, child_id), []).append((position, values))
+
+        ids = [None] * len(batch)
+        for (record_type, child_id), group in groups.items():
+            rows = [values for _, values in group]
+            group_ids = insert_records(record_type, child_id, rows)
+            update_summary(record_type, child_id, rows)
+            records_created(record_type, child_id, [
+                {"id": record_id, "child_id": child_id, **values} for values, record_id in zip(rows, group_ids)
+            ])
+            for (position, _), record_id in zip(group, group_ids):
+                ids[position] = record_id
+        db.session.commit()
+        return ids
+
+
+write_queue = GroupCommitQueue()
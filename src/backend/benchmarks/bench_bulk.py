@@ -0,0 +1,61 @@
+"""Compare the single-row record POST endpoints with the bulk ingest endpoint.
+
+Run from src/backend:  python -m benchmarks.bench_bulk [--records 500]
+A throwaway SQLite file is used so commits pay the same fsync cost as production.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+
+
+def make_app(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post("/children/", json={"name": "Bench", "sex": "Female", "date_of_birth": "2024-01-01"})
+    return client
+
+
+def feeds(count):
+    return [{
+        "feed_date": f"2025-01-{i % 28 + 1:02d}",
+        "feed_time": f"{i % 24:02d}:{i % 60:02d}",
+        "feed_type": "Liquid",
+        "food_name": "Milk",
+        "feed_amount": "120"
+    } for i in range(count)]
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_app(os.path.join(tmp, "single.sqlite"))
+        start = time.perf_counter()
+        for record in feeds(count):
+            assert client.post("/children/1/feed", json=record).status_code == 201
+        single = time.perf_counter() - start
+
+        client = make_app(os.path.join(tmp, "bulk.sqlite"))
+        start = time.perf_counter()
+        response = client.post("/children/1/feed/bulk", json={"records": feeds(count)})
+        assert response.status_code == 201
+        bulk = time.perf_counter() - start
+
+    print(f"{count} feeding records")
+    print(f"  single-row POSTs: {single:8.3f}s  {count / single:10.0f} records/s")
+    print(f"  one bulk POST:    {bulk:8.3f}s  {count / bulk:10.0f} records/s")
+    print(f"  speed-up:         {single / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=500)
+    run(parser.parse_args().records)
@@ -0,0 +1,100 @@
+"""Measure throughput and peak memory of the streaming export on a large synthetic history.
+
+Run from src/backend:  python -m benchmarks.bench_export [--rows 1000000] [--format ndjson]
+One child gets --rows records spread over all six record types and several years.
+Peak memory is traced with tracemalloc while the response is consumed chunk by chunk.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, time as dtime, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import Child
+from app.records import RECORD_TYPES
+
+
+def synthetic_values(name, day, rng):
+    clock = dtime(rng.randrange(24), rng.randrange(60))
+    if name == "sleep":
+        return {"sleep_date": day, "sleep_type": rng.choice(["Day time nap", "Night time sleep"]),
+                "start_time": clock, "end_time": dtime(rng.randrange(24), rng.randrange(60))}
+    if name == "feed":
+        return {"feed_date": day, "feed_time": clock, "feed_type": "Liquid", "food_name": "Milk", "feed_amount": "120"}
+    if name == "nappy":
+        return {"change_date": day, "change_time": clock, "change_type": rng.choice(["Wet", "Dirty"])}
+    if name == "medication":
+        return {"medication_date": day, "medication_time": clock, "medication_type": "Paracetamol", "dosage": "2.5ml"}
+    if name == "temperature":
+        return {"date": day, "temperature": round(rng.uniform(36.0, 38.5), 1), "temperature_time": clock}
+    return {"growth_date": day, "weight": round(rng.uniform(3, 15), 2), "height": round(rng.uniform(50, 100), 1)}
+
+
+def populate(app, rows, batch=20000):
+    rng = random.Random(42)
+    start_day = date(2020, 1, 1)
+    names = list(RECORD_TYPES)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Child(name="Bench", sex="Female", date_of_birth=start_day))
+        db.session.commit()
+        for offset in range(0, rows, batch):
+            chunk = {name: [] for name in names}
+            for i in range(offset, min(offset + batch, rows)):
+                name = names[i % len(names)]
+                day = start_day + timedelta(days=rng.randrange(5 * 365))
+                chunk[name].append(dict(synthetic_values(name, day, rng), child_id=1))
+            for name, values in chunk.items():
+                if values:
+                    db.session.execute(insert(RECORD_TYPES[name].model), values)
+            db.session.commit()
+
+
+def consume(client, export_format, trace):
+    """Read the export response chunk by chunk; returns bytes, seconds and peak traced memory"""
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(f"/children/1/export?format={export_format}", buffered=False)
+    size = sum(len(chunk) for chunk in response.response)
+    elapsed = time.perf_counter() - start
+    response.close()
+    peak = 0
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def run(rows, export_format):
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'export.sqlite')}"
+
+        app = create_app(BenchConfig)
+        start = time.perf_counter()
+        populate(app, rows)
+        print(f"Populated {rows} rows in {time.perf_counter() - start:.1f}s")
+
+        client = app.test_client()
+        size, elapsed, _ = consume(client, export_format, trace=False)
+        # A second, traced pass for memory; tracemalloc slows everything down
+        _, _, peak = consume(client, export_format, trace=True)
+
+    print(f"Exported {size / 1e6:.1f} MB of {export_format} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Peak traced memory while streaming: {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    run(args.rows, args.format)
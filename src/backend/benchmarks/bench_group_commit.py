@@ -0,0 +1,72 @@
+"""Compare record inserts per second with and without group commit.
+
+Run from src/backend:  python -m benchmarks.bench_group_commit [--threads 16 --requests 200]
+Concurrent clients POST single feed records to a file database, once committing per
+request and once through the group-commit writer, under the default and production PRAGMAs.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+from app import create_app
+from app.config import Config, ProductionConfig
+from app.extensions import db
+from app.models import Child
+
+
+def make_app(base, path, group_commit):
+    class BenchConfig(base):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        GROUP_COMMIT_ENABLED = group_commit
+        METRICS_ENABLED = False
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Child(name="Bench", date_of_birth=date(2024, 1, 1), sex="Female"))
+        db.session.commit()
+    return app
+
+
+def post_records(app, count, failures):
+    client = app.test_client()
+    record = {"feed_date": "2024-05-01", "feed_time": "08:00", "feed_type": "Bottle", "feed_amount": "120"}
+    for _ in range(count):
+        if client.post("/children/1/feed", json=record).status_code != 201:
+            failures.append(1)
+
+
+def run_case(base, group_commit, threads, requests):
+    with tempfile.TemporaryDirectory() as directory:
+        app = make_app(base, os.path.join(directory, "bench.sqlite"), group_commit)
+        failures = []
+        workers = [threading.Thread(target=post_records, args=(app, requests, failures)) for _ in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        with app.app_context():
+            db.engine.dispose()
+    return threads * requests / elapsed, len(failures)
+
+
+def run(threads, requests):
+    print(f"{threads} client threads x {requests} single-record POSTs")
+    for label, base in (("default", Config), ("production", ProductionConfig)):
+        for group_commit in (False, True):
+            rate, failed = run_case(base, group_commit, threads, requests)
+            mode = "group commit" if group_commit else "per request "
+            print(f"  {label:<10} {mode}: {rate:8.0f} inserts/s" + (f"  ({failed} failed)" if failed else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    run(args.threads, args.requests)
@@ -0,0 +1,69 @@
+"""Time the WHO growth percentile engine on a cohort of children.
+
+Run from src/backend:  python -m benchmarks.bench_growth [--children 5000 --measurements 24]
+Growth histories are inserted straight into an in-memory database, then every
+record of every child is scored in one call.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.growth import growth_percentiles
+from app.models import Child, GrowthRecord
+
+
+def populate(children, measurements, seed=0):
+    rng = random.Random(seed)
+    db.session.execute(insert(Child), [{
+        "id": number + 1,
+        "name": f"Child {number + 1}",
+        "sex": rng.choice(["Male", "Female"]),
+        "date_of_birth": date(2022, 1, 1) + timedelta(days=rng.randrange(365)),
+    } for number in range(children)])
+    rows = []
+    for child_id in range(1, children + 1):
+        weight, height = rng.uniform(3.0, 4.0), rng.uniform(48.0, 54.0)
+        for month in range(measurements):
+            weight += rng.uniform(0.1, 0.6)
+            height += rng.uniform(0.5, 2.0)
+            rows.append({
+                "child_id": child_id, "growth_date": date(2023, 1, 1) + timedelta(days=30 * month),
+                "weight": round(weight, 2), "height": round(height, 1),
+            })
+    db.session.execute(insert(GrowthRecord), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def run(children, measurements):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        records = populate(children, measurements)
+        child_ids = list(range(1, children + 1))
+        growth_percentiles(child_ids[:1])  # load the reference tables
+
+        start = time.perf_counter()
+        results = growth_percentiles(child_ids)
+        elapsed = time.perf_counter() - start
+
+    assert sum(len(scored) for scored in results.values()) == records
+    print(f"{children} children, {records} growth records")
+    print(f"  scored in {elapsed:.3f}s  ({records / elapsed:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=5000)
+    parser.add_argument("--measurements", type=int, default=24)
+    args = parser.parse_args()
+    run(args.children, args.measurements)
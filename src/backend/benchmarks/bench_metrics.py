@@ -0,0 +1,58 @@
+"""Measure the per-request cost of the /metrics instrumentation.
+
+Run from src/backend:  python -m benchmarks.bench_metrics [--requests 2000]
+The same in-memory database and requests are timed with METRICS_ENABLED on and off.
+"""
+import argparse
+import time
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.seed import seed_database
+
+
+def make_client(enabled):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = "sqlite://"
+        METRICS_ENABLED = enabled
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        seed_database(children=1, days=60, echo=lambda message: None)
+    return app.test_client()
+
+
+def timed(client, count):
+    urls = ["/children/1/feed?limit=20", "/children/1", "/api/children/1/sleep-stats"]
+    for url in urls:
+        client.get(url)
+    start = time.perf_counter()
+    for i in range(count):
+        assert client.get(urls[i % len(urls)]).status_code == 200
+    return (time.perf_counter() - start) / count
+
+
+def run(count, rounds):
+    clients = {enabled: make_client(enabled) for enabled in (False, True)}
+    # Alternate off and on within every round, so drift over the run hits both sides alike,
+    # and keep the best round of each to even out noise
+    timings = {False: [], True: []}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            timings[enabled].append(timed(clients[enabled], count))
+    best = {enabled: min(values) for enabled, values in timings.items()}
+    overhead = best[True] - best[False]
+    print(f"{count} requests x {rounds} rounds")
+    print(f"  metrics off: {best[False] * 1e6:8.1f}us/request")
+    print(f"  metrics on:  {best[True] * 1e6:8.1f}us/request")
+    print(f"  overhead:    {overhead * 1e6:8.1f}us/request ({overhead / best[False]:.1%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    run(args.requests, args.rounds)
@@ -0,0 +1,51 @@
+"""Measure how nightly report generation scales with worker processes.
+
+Run from src/backend:  python -m benchmarks.bench_reports [--children 2000 --workers 1,2,4]
+Seeds a throwaway file database and times `flask reports generate` for each worker count.
+"""
+import argparse
+import os
+import tempfile
+from datetime import date, timedelta
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.report_jobs import generate_reports
+from app.seed import seed_database
+
+
+class BenchConfig(Config):
+    # Pointed at the throwaway database in run()
+    SQLALCHEMY_DATABASE_URI = None
+    METRICS_ENABLED = False
+
+
+def run(children, days, worker_counts, shard_size):
+    with tempfile.TemporaryDirectory() as directory:
+        BenchConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'bench.sqlite')}"
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            seed_database(children=children, days=days, echo=lambda message: None)
+            report_date = date.today() - timedelta(days=1)
+
+            print(f"{children} children, {days} days of history, cpu count {os.cpu_count()}")
+            baseline = None
+            for workers in worker_counts:
+                written, elapsed = generate_reports(
+                    report_date, workers=workers, shard_size=shard_size, echo=lambda message: None
+                )
+                baseline = baseline or elapsed
+                print(f"  {workers:>2} workers: {elapsed:6.2f}s  {written / elapsed:8.0f} reports/s"
+                      f"  speedup {baseline / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to time")
+    parser.add_argument("--shard-size", type=int, default=100)
+    args = parser.parse_args()
+    run(args.children, args.days, [int(count) for count in args.workers.split(",")], args.shard_size)
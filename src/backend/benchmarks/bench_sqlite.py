@@ -0,0 +1,91 @@
+"""Concurrent caregiver writes and dashboard reads under the default and production SQLite profiles.
+
+Run from src/backend:  python -m benchmarks.bench_sqlite [--writers 4] [--readers 8] [--seconds 5]
+Each profile gets a fresh database file. Writers POST feeding records while readers
+fetch the combined records endpoint; failed requests ("database is locked") are counted.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.config import Config, ProductionConfig
+from app.extensions import db
+
+
+def make_app(base, path):
+    class BenchConfig(base):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        REPORT_CACHE_SIZE = 0
+
+    app = create_app(BenchConfig)
+    # Lock errors are expected under the default profile; keep the tracebacks out of the output
+    app.logger.disabled = True
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    client.post("/children/", json={"name": "Bench", "sex": "Female", "date_of_birth": "2024-01-01"})
+    return app
+
+
+def worker(app, kind, deadline, counts, lock):
+    client = app.test_client()
+    ok = failed = 0
+    latencies = []
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if kind == "write":
+            response = client.post("/children/1/feed", json={
+                "feed_date": f"2025-01-{i % 28 + 1:02d}", "feed_time": f"{i % 24:02d}:00", "feed_type": "Liquid"
+            })
+        else:
+            response = client.get("/children/1/records?types=feed,sleep&from=2025-01-01&to=2025-01-07")
+        latencies.append(time.perf_counter() - start)
+        if response.status_code < 400:
+            ok += 1
+        else:
+            failed += 1
+        i += 1
+    with lock:
+        counts[kind]["ok"] += ok
+        counts[kind]["failed"] += failed
+        counts[kind]["latencies"].extend(latencies)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def run_profile(name, base, writers, readers, seconds, tmp):
+    app = make_app(base, os.path.join(tmp, f"{name}.sqlite"))
+    counts = {kind: {"ok": 0, "failed": 0, "latencies": []} for kind in ("write", "read")}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=worker, args=(app, "write", deadline, counts, lock)) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=(app, "read", deadline, counts, lock)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"{name} profile")
+    for kind, result in counts.items():
+        p95 = percentile(result["latencies"], 0.95) * 1000
+        print(f"  {kind:5}: {result['ok'] / seconds:8.0f} ok/s  {result['failed']:6} failed  p95 {p95:7.1f} ms")
+    with app.app_context():
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, base in (("default", Config), ("production", ProductionConfig)):
+            run_profile(name, base, args.writers, args.readers, args.seconds, tmp)
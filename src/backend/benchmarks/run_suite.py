@@ -0,0 +1,184 @@
+"""Endpoint benchmark suite: latency percentiles, throughput and SQL query count per endpoint.
+
+Run from src/backend:
+    python -m benchmarks.run_suite [--children 5] [--days 365] [--requests 50] [--output results.json]
+    python -m benchmarks.run_suite --compare results-before.json
+
+A throwaway SQLite database is seeded with `flask seed` data, every blueprint endpoint
+is driven through the Flask test client, and the results are written as JSON so runs
+from different commits can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.records import RECORD_TYPES
+from app.seed import seed_database
+
+END_DATE = date(2025, 6, 30)
+
+# A representative record per type for the POST benchmarks
+NEW_RECORDS = {
+    "sleep": {"sleep_date": "2025-06-30", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:15"},
+    "feed": {"feed_date": "2025-06-30", "feed_time": "08:00", "feed_type": "Liquid", "food_name": "Milk", "feed_amount": "150"},
+    "nappy": {"change_date": "2025-06-30", "change_time": "09:00", "change_type": "Wet"},
+    "medication": {"medication_date": "2025-06-30", "medication_time": "09:00", "medication_type": "Paracetamol", "dosage": "2.5ml"},
+    "temperature": {"date": "2025-06-30", "temperature": "37.2", "temperature_time": "09:00"},
+    "growth": {"growth_date": "2025-06-30", "weight": "9.2", "height": "74.5"},
+}
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self.before_cursor_execute)
+
+    def before_cursor_execute(self, *args):
+        self.count += 1
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(client, counter, method, url_for, requests, json_for=None, warmup=3):
+    """Issue `requests` calls; url_for/json_for map the iteration number to the request"""
+    for i in range(warmup):
+        response = client.open(url_for(i), method=method, json=json_for(i) if json_for else None)
+        response.close()
+    latencies, queries, size = [], 0, 0
+    for i in range(warmup, warmup + requests):
+        before = counter.count
+        start = time.perf_counter()
+        response = client.open(url_for(i), method=method, json=json_for(i) if json_for else None)
+        body = response.get_data()
+        latencies.append(time.perf_counter() - start)
+        queries += counter.count - before
+        size += len(body)
+        assert response.status_code < 400, (method, url_for(i), response.status_code)
+    total = sum(latencies)
+    return {
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "requests_per_s": round(requests / total, 1),
+        "queries_per_request": round(queries / requests, 2),
+        "bytes_per_response": round(size / requests),
+    }
+
+
+def run(children, days, requests):
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'suite.sqlite')}"
+            # Measure the work behind each endpoint, not the report cache
+            REPORT_CACHE_SIZE = 0
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            child_ids = seed_database(children=children, days=days, seed=1, end_date=END_DATE,
+                                      echo=lambda message: None)
+            counter = QueryCounter(db.engine)
+        client = app.test_client()
+
+        def child(i):
+            return child_ids[i % len(child_ids)]
+
+        def report_day(i):
+            return (END_DATE - timedelta(days=i % days)).isoformat()
+
+        results = {}
+
+        def bench(name, method, url_for, json_for=None):
+            results[name] = measure(client, counter, method, url_for, requests, json_for)
+            print(f"{name:46} p50 {results[name]['p50_ms']:9.2f} ms  p95 {results[name]['p95_ms']:9.2f} ms  "
+                  f"{results[name]['queries_per_request']:6.1f} queries")
+
+        bench("GET /children/", "GET", lambda i: "/children/")
+        bench("GET /children/<id>", "GET", lambda i: f"/children/{child(i)}")
+        for name in RECORD_TYPES:
+            bench(f"GET /children/<id>/{name}", "GET", lambda i, n=name: f"/children/{child(i)}/{n}")
+            bench(f"GET /children/<id>/{name}?limit=50", "GET",
+                  lambda i, n=name: f"/children/{child(i)}/{n}?limit=50")
+        bench("GET /children/<id>/records", "GET", lambda i: f"/children/{child(i)}/records")
+        bench("GET /api/children/<id>/daily-report", "GET",
+              lambda i: f"/api/children/{child(i)}/daily-report?date={report_day(i)}")
+        bench("GET /api/children/<id>/sleep-stats", "GET",
+              lambda i: f"/api/children/{child(i)}/sleep-stats?from={END_DATE - timedelta(days=365)}"
+                        f"&to={END_DATE}&bucket=week")
+        bench("GET /children/<id>/export", "GET", lambda i: f"/children/{child(i)}/export")
+
+        for name in RECORD_TYPES:
+            bench(f"POST /children/<id>/{name}", "POST", lambda i, n=name: f"/children/{child(i)}/{n}",
+                  lambda i, n=name: NEW_RECORDS[n])
+        bench("POST /children/<id>/feed/bulk (100)", "POST", lambda i: f"/children/{child(i)}/feed/bulk",
+              lambda i: {"records": [NEW_RECORDS["feed"]] * 100})
+
+        # Delete the records the POST benchmarks just created
+        for name in RECORD_TYPES:
+            model = RECORD_TYPES[name].model
+            with app.app_context():
+                rows = db.session.query(model.id, model.child_id).order_by(model.id.desc()).limit(requests + 3).all()
+            bench(f"DELETE /children/<id>/{name}/<record_id>", "DELETE",
+                  lambda i, rows=rows, n=name: f"/children/{rows[i][1]}/{n}/{rows[i][0]}")
+
+        with app.app_context():
+            db.engine.dispose()
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(current, previous_path):
+    with open(previous_path) as f:
+        previous = json.load(f)["endpoints"]
+    print(f"\nChange in p50 latency against {previous_path}")
+    for name, result in current.items():
+        if name in previous and previous[name]["p50_ms"]:
+            change = (result["p50_ms"] / previous[name]["p50_ms"] - 1) * 100
+            print(f"  {name:46} {change:+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    endpoints = run(args.children, args.days, args.requests)
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "children": args.children,
+            "days": args.days,
+            "requests": args.requests,
+        },
+        "endpoints": endpoints,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(endpoints, args.compare)
@@ -0,0 +1,39 @@
+import pytest
+from app import create_app
+from app.config import Config
+from app.extensions import db, report_cache
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app on a temporary SQLite file, with extra settings on top of the defaults"""
+    def make(create=True, **settings):
+        config = type("TestConfig", (Config,), {
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'children.sqlite'}",
+            **settings,
+        })
+        app = create_app(config)
+        # The cache is process-wide, and every test database starts over at the same versions
+        report_cache.clear()
+        if create:
+            with app.app_context():
+                db.create_all()
+        return app
+    return make
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def child_id(client):
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    return client.get("/children/").json["results"][-1]["id"]
@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import func, select
+from app.archive import archive
+from app.extensions import db
+from app.records import RECORD_TYPES
+
+RECENT = (date.today() - timedelta(days=1)).isoformat()
+
+READS = [
+    "/children/1/feed",
+    "/children/1/sleep?from=2025-01-01&to=2025-01-31",
+    "/children/1/records",
+    "/children/1/records?format=columnar",
+    "/children/1/export",
+    "/children/1/growth/percentiles",
+    "/children/1/series/feed?bucket=day",
+    "/children/1/series/sleep?bucket=hour",
+    "/children/1/series/weight",
+    "/api/children/1/daily-report?date=2025-01-02",
+    "/api/daily-report?date=2025-01-02&child_ids=1",
+    "/api/children/1/sleep-stats?from=2024-12-01&to=2025-02-01&bucket=week",
+    "/children/1/search?q=apple",
+]
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    app = make_app(ARCHIVE_DATABASE=str(tmp_path / "archive.sqlite"))
+    client = app.test_client()
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    records = []
+    for day in ["2025-01-01", "2025-01-02", RECENT]:
+        records += [
+            {"type": "feed", "feed_date": day, "feed_time": "08:00", "feed_type": "Solid", "food_name": "Apple puree"},
+            {"type": "feed", "feed_date": day, "feed_time": "12:00", "feed_type": "Liquid", "feed_amount": "120"},
+            {"type": "sleep", "sleep_date": day, "sleep_type": "Day time nap", "start_time": "10:00",
+             "end_time": "11:30"},
+            {"type": "growth", "growth_date": day, "weight": "7.5", "height": "65"},
+        ]
+    assert client.post("/children/1/bulk", json={"records": records}).status_code == 201
+    return app
+
+
+def archived_count(app, name):
+    with app.app_context():
+        return db.session.scalar(select(func.count()).select_from(archive.table(RECORD_TYPES[name])))
+
+
+def run_archive(app):
+    result = app.test_cli_runner().invoke(args=["archive", "--days", "30"])
+    assert result.exit_code == 0, result.output
+
+
+def test_reads_are_unchanged_by_archiving(app, client):
+    before = {url: client.get(url).get_data(as_text=True) for url in READS}
+    run_archive(app)
+    assert archived_count(app, "feed") == 4
+    assert archived_count(app, "sleep") == 2
+    assert {url: client.get(url).get_data(as_text=True) for url in READS} == before
+
+
+def test_delete_archived_record(app, client):
+    old_ids = [record["id"] for record in client.get("/children/1/feed?to=2025-01-31").json["results"]]
+    run_archive(app)
+    assert client.delete(f"/children/1/feed/{old_ids[0]}").status_code == 200
+    assert client.delete(f"/children/1/feed/{old_ids[0]}").status_code == 404
+    assert archived_count(app, "feed") == 3
+    assert [record["id"] for record in client.get("/children/1/feed?to=2025-01-31").json["results"]] == old_ids[1:]
+
+
+def test_archived_ids_are_not_reused(app, client):
+    newest = max(record["id"] for record in client.get("/children/1/feed").json["results"])
+    # Archive everything, the newest row included, then create a new record
+    result = app.test_cli_runner().invoke(args=["archive", "--days", "-1"])
+    assert result.exit_code == 0, result.output
+    response = client.post("/children/1/feed", json={"feed_date": RECENT, "feed_time": "18:00",
+                                                     "feed_type": "Solid"})
+    assert response.json["id"] == newest + 1
+    ids = [record["id"] for record in client.get("/children/1/feed").json["results"]]
+    assert len(ids) == len(set(ids)) == 7
+
+
+def test_purge_removes_archived_records(app, client):
+    run_archive(app)
+    result = app.test_cli_runner().invoke(args=["purge", "1"])
+    assert result.exit_code == 0, result.output
+    assert archived_count(app, "feed") == 0
+    assert client.get("/children/1/search?q=apple").status_code == 404
+
+
+def test_archive_needs_the_setting(make_app):
+    result = make_app().test_cli_runner().invoke(args=["archive"])
+    assert result.exit_code != 0
+    assert "Set ARCHIVE_DATABASE" in result.output
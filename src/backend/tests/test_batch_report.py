@@ -0,0 +1,48 @@
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+def add_child(client, name):
+    client.post("/children/", json={"name": name, "sex": "Female", "date_of_birth": "2024-01-05"})
+    return client.get("/children/").json["results"][-1]["id"]
+
+
+def feeds_count_of(report):
+    return report["today_summary"]["feeds_count"]
+
+
+def test_batch_report(client, child_id):
+    other = add_child(client, "Grace")
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    response = client.get(f"/api/daily-report?date=2025-01-01&child_ids={child_id},99,{other}")
+    assert response.status_code == 200
+    assert response.json["not_found"] == [99]
+    assert list(response.json["results"]) == [str(child_id), str(other)]
+    assert feeds_count_of(response.json["results"][str(child_id)]) == 1
+    assert feeds_count_of(response.json["results"][str(other)]) == 0
+
+
+def test_batch_matches_single_reports(client, child_id):
+    other = add_child(client, "Grace")
+    client.post(f"/children/{other}/feed", json=FEED)
+    batch = client.get(f"/api/daily-report?date=2025-01-01&child_ids={other},{child_id}").json["results"]
+    for each in (child_id, other):
+        single = client.get(f"/api/children/{each}/daily-report?date=2025-01-01").json
+        assert batch[str(each)] == single
+
+
+def test_batch_etag(client, child_id):
+    url = f"/api/daily-report?date=2025-01-01&child_ids={child_id}"
+    etag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert feeds_count_of(response.json["results"][str(child_id)]) == 1
+
+
+def test_batch_rejects_bad_child_ids(app, client, child_id):
+    assert client.get("/api/daily-report?date=2025-01-01").status_code == 400
+    assert client.get("/api/daily-report?date=2025-01-01&child_ids=1,x").status_code == 400
+    too_many = ",".join(str(n) for n in range(app.config["MAX_REPORT_CHILDREN"] + 1))
+    assert client.get(f"/api/daily-report?date=2025-01-01&child_ids={too_many}").status_code == 400
+    assert client.get(f"/api/daily-report?date=01-01-2025&child_ids={child_id}").status_code == 400
@@ -0,0 +1,61 @@
+NAPPY = {"type": "nappy", "change_date": "2025-02-01", "change_time": "01:00", "change_type": "Wet"}
+GROWTH = {"type": "growth", "growth_date": "2025-02-01", "weight": "8", "height": "70"}
+
+
+def test_mixed_batch(client, child_id):
+    response = client.post(f"/children/{child_id}/bulk", json={"records": [NAPPY, GROWTH, NAPPY]})
+    assert response.status_code == 201
+    results = response.json["results"]
+    assert [(result["index"], result["type"]) for result in results] == [(0, "nappy"), (1, "growth"), (2, "nappy")]
+    nappies = client.get(f"/children/{child_id}/nappy").json["results"]
+    assert sorted(record["id"] for record in nappies) == sorted([results[0]["id"], results[2]["id"]])
+
+
+def test_typed_batch(client, child_id):
+    records = [{"feed_date": "2025-02-01", "feed_time": f"0{hour}:00", "feed_type": "Solid"} for hour in range(3)]
+    response = client.post(f"/children/{child_id}/feed/bulk", json={"records": records})
+    assert response.status_code == 201
+    ids = [result["id"] for result in response.json["results"]]
+    listed = client.get(f"/children/{child_id}/feed").json["results"]
+    # Newest first, so the ids come back reversed
+    assert [record["id"] for record in listed] == ids[::-1]
+
+
+def test_invalid_items_reject_the_whole_batch(client, child_id):
+    records = [NAPPY, {"type": "growth", "growth_date": "2025-02-01"}, {"type": "zzz"}, 5,
+               {**GROWTH, "weight": "heavy"}, {**NAPPY, "change_time": ""}]
+    response = client.post(f"/children/{child_id}/bulk", json={"records": records})
+    assert response.status_code == 400
+    assert response.json == {"error": "Invalid records", "errors": [
+        {"index": 1, "error": "Missing required fields"},
+        {"index": 2, "error": "Unknown record type"},
+        {"index": 3, "error": "Unknown record type"},
+        {"index": 4, "error": "Invalid value for weight"},
+        {"index": 5, "error": "Invalid value for change_time"},
+    ]}
+    assert client.get(f"/children/{child_id}/nappy").json["results"] == []
+
+
+def test_malformed_batches(make_app):
+    app = make_app(MAX_BULK_SIZE=2)
+    client = app.test_client()
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    error = {"error": "Expected a non-empty records list of at most 2 items"}
+    for body in [{}, {"records": []}, {"records": "x"}, {"records": [NAPPY] * 3}]:
+        response = client.post("/children/1/bulk", json=body)
+        assert (response.status_code, response.json) == (400, error)
+
+
+def test_unknown_child_or_type(client, child_id):
+    assert client.post("/children/99/bulk", json={"records": [NAPPY]}).status_code == 404
+    assert client.post(f"/children/{child_id}/xx/bulk", json={"records": [NAPPY]}).status_code == 404
+
+
+def test_typed_batch_rejects_other_types(client, child_id):
+    sleep = {"sleep_date": "2025-02-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:00"}
+    response = client.post(f"/children/{child_id}/sleep/bulk", json={"records": [
+        sleep, {**sleep, "type": "sleep"}, {**NAPPY, "type": "nappy"},
+    ]})
+    assert response.status_code == 400
+    assert response.json["errors"] == [{"index": 2, "error": "Expected a sleep record"}]
+    assert client.get(f"/children/{child_id}/nappy").json["results"] == []
@@ -0,0 +1,58 @@
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+NAPPY = {"change_date": "2025-01-01", "change_time": "09:00", "change_type": "Wet"}
+
+
+def changes(client, child_id, since):
+    response = client.get(f"/children/{child_id}/changes?since={since}")
+    assert response.status_code == 200
+    return response.json["results"]
+
+
+def test_changes_since_a_version(client, child_id):
+    first = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    token = client.get(f"/children/{child_id}/records").json["version"]
+    assert changes(client, child_id, token)["changed"]["feed"] == []
+
+    second = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    client.post(f"/children/{child_id}/nappy", json=NAPPY)
+    result = changes(client, child_id, token)
+    assert [record["id"] for record in result["changed"]["feed"]] == [second]
+    assert len(result["changed"]["nappy"]) == 1
+    assert result["changed"]["sleep"] == []
+    assert result["version"] > token
+    assert [record["id"] for record in changes(client, child_id, 0)["changed"]["feed"]] == [first, second]
+    assert changes(client, child_id, result["version"])["changed"]["nappy"] == []
+
+
+def test_tombstones(client, child_id):
+    record_id = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    token = changes(client, child_id, 0)["version"]
+    client.delete(f"/children/{child_id}/feed/{record_id}")
+
+    result = changes(client, child_id, token)
+    assert result["deleted"]["feed"] == [record_id]
+    assert result["changed"]["feed"] == []
+    # A client that is already past the delete doesn't hear of it again
+    assert changes(client, child_id, result["version"])["deleted"]["feed"] == []
+
+
+def test_one_version_per_commit(client, child_id):
+    token = changes(client, child_id, 0)["version"]
+    client.post(f"/children/{child_id}/bulk", json={"records": [{"type": "feed", **FEED}, {"type": "nappy", **NAPPY}]})
+    result = changes(client, child_id, token)
+    assert result["version"] == token + 1
+
+
+def test_other_children_are_left_out(client, child_id):
+    client.post("/children/", json={"name": "Bo", "sex": "Male", "date_of_birth": "2024-03-01"})
+    record_id = client.post(f"/children/{child_id + 1}/feed", json=FEED).json["id"]
+    client.delete(f"/children/{child_id + 1}/feed/{record_id}")
+    result = changes(client, child_id, 0)
+    assert result["changed"]["feed"] == [] and result["deleted"]["feed"] == []
+
+
+def test_bad_token(client, child_id):
+    for query in ["", "?since=x", "?since=-1"]:
+        response = client.get(f"/children/{child_id}/changes{query}")
+        assert (response.status_code, response.json) == (400, {"error": "since must be a non-negative sync token"})
+    assert client.get("/children/99/changes?since=0").status_code == 404
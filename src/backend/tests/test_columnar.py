@@ -0,0 +1,43 @@
+import pytest
+
+SLEEPS = [
+    {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"},
+    {"sleep_date": "2025-01-02", "sleep_type": "Night time sleep", "start_time": "19:00", "end_time": "06:30"},
+]
+
+
+@pytest.fixture
+def sleeps(client, child_id):
+    client.post(f"/children/{child_id}/sleep/bulk", json={"records": SLEEPS})
+
+
+def as_objects(columnar):
+    return [dict(zip(columnar["columns"], row), child_id=columnar["child_id"]) for row in columnar["rows"]]
+
+
+def test_list_columnar_matches_objects(client, child_id, sleeps):
+    objects = client.get(f"/children/{child_id}/sleep").json["results"]
+    columnar = client.get(f"/children/{child_id}/sleep?format=columnar").json["results"]
+    assert columnar["columns"] == ["id", "sleep_date", "sleep_type", "start_time", "end_time"]
+    assert columnar["child_id"] == child_id
+    assert as_objects(columnar) == objects
+
+
+def test_columnar_pages(client, child_id, sleeps):
+    response = client.get(f"/children/{child_id}/sleep?format=columnar&limit=1").json
+    assert [row[1] for row in response["results"]["rows"]] == ["2025-01-02"]
+    cursor = response["next_cursor"]
+    response = client.get(f"/children/{child_id}/sleep?format=columnar&limit=1&cursor={cursor}").json
+    assert [row[1] for row in response["results"]["rows"]] == ["2025-01-01"]
+    assert response["next_cursor"] is None
+
+
+def test_records_columnar(client, child_id, sleeps):
+    objects = client.get(f"/children/{child_id}/records?types=sleep").json["results"]["sleep"]
+    columnar = client.get(f"/children/{child_id}/records?types=sleep&format=columnar").json["results"]["sleep"]
+    assert as_objects(columnar) == objects
+
+
+def test_unknown_format(client, child_id):
+    response = client.get(f"/children/{child_id}/sleep?format=xml")
+    assert (response.status_code, response.json) == (400, {"error": "format must be one of objects, columnar"})
@@ -0,0 +1,78 @@
+import json
+import pytest
+from app.extensions import events
+
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app(EVENTS_HEARTBEAT=1).test_client()
+
+
+def parse(chunk):
+    """(event, id, data) of one event chunk; comments and retry lines come back as None"""
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    if "event" not in fields:
+        return None
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+def next_event(stream):
+    while True:
+        event = parse(next(stream))
+        if event is not None:
+            return event
+
+
+def open_stream(client, child_id, **kwargs):
+    response = client.get(f"/children/{child_id}/events", buffered=False, **kwargs)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    return response, iter(response.response)
+
+
+def test_resume_from_last_event_id(client, child_id):
+    token = client.get(f"/children/{child_id}/records").json["version"]
+    record_id = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+
+    response, stream = open_stream(client, child_id, headers={"Last-Event-ID": str(token)})
+    event, version, data = next_event(stream)
+    assert event == "changes"
+    assert [record["id"] for record in data["changed"]["feed"]] == [record_id]
+    assert version == data["version"] > token
+    assert next_event(stream) == ("ready", version, {"version": version})
+    response.close()
+
+
+def test_live_event_after_ready(client, child_id):
+    response, stream = open_stream(client, child_id)
+    event, version, _ = next_event(stream)
+    assert event == "ready"
+
+    record_id = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    event, live_version, data = next_event(stream)
+    assert event == "changes"
+    assert live_version > version
+    assert [record["id"] for record in data["changed"]["feed"]] == [record_id]
+    response.close()
+
+
+def test_bad_last_event_id(client, child_id):
+    response = client.get(f"/children/{child_id}/events", headers={"Last-Event-ID": "abc"})
+    assert response.status_code == 400
+    assert client.get("/children/999/events").status_code == 404
+
+
+def test_state_dropped_without_subscribers(client, child_id):
+    response, stream = open_stream(client, child_id)
+    next_event(stream)
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    assert child_id in events._buffers
+
+    response.close()
+    assert child_id not in events._buffers
+    assert child_id not in events._conditions
+    # Nobody listens, so nothing is kept for the child
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    assert child_id not in events._buffers
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import pytest
+from app import export
+
+RECORDS = [
+    {"type": "feed", "feed_date": "2025-01-02", "feed_time": "08:00", "feed_type": "Solid", "food_name": "Pear, ripe"},
+    {"type": "feed", "feed_date": "2025-01-01", "feed_time": "12:30", "feed_type": "Liquid", "feed_amount": "120"},
+    {"type": "growth", "growth_date": "2025-01-01", "weight": "7.5", "height": "65"},
+    {"type": "temperature", "date": "2025-01-01", "temperature": "37.2", "temperature_time": ""},
+]
+
+
+@pytest.fixture
+def history(client, child_id):
+    assert client.post(f"/children/{child_id}/bulk", json={"records": RECORDS}).status_code == 201
+
+
+def test_ndjson(client, child_id, history):
+    response = client.get(f"/children/{child_id}/export")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["Content-Disposition"] == f"attachment; filename=child-{child_id}.ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    # Type by type, each oldest first
+    assert lines == [
+        {"type": "feed", "id": 2, "child_id": child_id, "feed_date": "2025-01-01", "feed_time": "12:30",
+         "food_name": None, "feed_type": "Liquid", "feed_amount": "120"},
+        {"type": "feed", "id": 1, "child_id": child_id, "feed_date": "2025-01-02", "feed_time": "08:00",
+         "food_name": "Pear, ripe", "feed_type": "Solid", "feed_amount": None},
+        {"type": "temperature", "id": 1, "child_id": child_id, "date": "2025-01-01", "temperature": 37.2,
+         "temperature_time": None},
+        {"type": "growth", "id": 1, "child_id": child_id, "growth_date": "2025-01-01", "weight": 7.5,
+         "height": 65.0},
+    ]
+
+
+def test_csv(client, child_id, history):
+    response = client.get(f"/children/{child_id}/export?format=csv")
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert list(rows[0]) == export.CSV_COLUMNS
+    assert [(row["type"], row["id"]) for row in rows] == [("feed", "2"), ("feed", "1"), ("temperature", "1"),
+                                                           ("growth", "1")]
+    assert rows[1]["food_name"] == "Pear, ripe"
+    assert rows[2]["temperature"] == "37.2" and rows[2]["temperature_time"] == ""
+    assert rows[3]["weight"] == "7.5" and rows[3]["feed_date"] == ""
+
+
+def test_streams_in_chunks(client, child_id, monkeypatch):
+    monkeypatch.setattr(export, "CHUNK_SIZE", 2)
+    records = [{"type": "nappy", "change_date": "2025-01-01", "change_time": f"0{hour}:00", "change_type": "Wet"}
+               for hour in range(5)]
+    client.post(f"/children/{child_id}/bulk", json={"records": records})
+    response = client.get(f"/children/{child_id}/export?format=csv", buffered=False)
+    chunks = list(response.response)
+    assert len(chunks) > 2
+    assert b"".join(chunks).count(b"\r\nnappy,") == 5
+
+
+def test_empty_history_and_errors(client, child_id):
+    assert client.get(f"/children/{child_id}/export").data == b""
+    assert client.get(f"/children/{child_id}/export?format=csv").get_data(as_text=True).strip() == \
+        ",".join(export.CSV_COLUMNS)
+    assert client.get(f"/children/{child_id}/export?format=xml").status_code == 400
+    assert client.get("/children/99/export").status_code == 404
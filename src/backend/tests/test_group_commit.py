@@ -0,0 +1,58 @@
+import pytest
+from app.write_queue import write_queue
+
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+@pytest.fixture
+def make_client(make_app):
+    def make(**settings):
+        return make_app(GROUP_COMMIT_ENABLED=True, **settings).test_client()
+    return make
+
+
+def feed_ids(client, child_id):
+    return [record["id"] for record in client.get(f"/children/{child_id}/feed").json["results"]]
+
+
+def add_child(client):
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    return client.get("/children/").json["results"][-1]["id"]
+
+
+def test_queued_creates_return_their_ids(make_client):
+    client = make_client()
+    child_id = add_child(client)
+    ids = [client.post(f"/children/{child_id}/feed", json=FEED).json["id"] for _ in range(3)]
+    assert len(set(ids)) == 3
+    assert sorted(feed_ids(client, child_id)) == sorted(ids)
+    report = client.get(f"/api/children/{child_id}/daily-report?date=2025-01-01").json
+    assert report["today_summary"]["feeds_count"] == 3
+
+
+def test_full_queue_answers_503(make_client, monkeypatch):
+    client = make_client(GROUP_COMMIT_QUEUE_SIZE=1)
+    child_id = add_child(client)
+    # No writer drains the queue, and one row already fills it
+    monkeypatch.setattr(write_queue, "_ensure_writer", lambda: None)
+    write_queue._queue.put_nowait(None)
+
+    response = client.post(f"/children/{child_id}/feed", json=FEED)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert feed_ids(client, child_id) == []
+
+
+def test_timed_out_create_answers_503_and_is_withdrawn(make_client, monkeypatch):
+    client = make_client(GROUP_COMMIT_TIMEOUT=0.05)
+    child_id = add_child(client)
+    monkeypatch.setattr(write_queue, "_ensure_writer", lambda: None)
+
+    response = client.post(f"/children/{child_id}/feed", json=FEED)
+    assert response.status_code == 503
+    assert "not added" in response.json["error"]
+
+    # Once a writer runs, the withdrawn row is dropped rather than committed late
+    monkeypatch.undo()
+    record_id = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    assert feed_ids(client, child_id) == [record_id]
@@ -0,0 +1,94 @@
+import json
+import math
+import numpy as np
+from sqlalchemy import text
+from app.extensions import db
+from app.growth import lms_table, normal_cdf, percentiles, zscores
+
+
+def test_median_scores_zero():
+    L, M, S = lms_table("weight_for_age")
+    z = zscores("weight_for_age", [0, 1], [0, 365], [M[0, 0], M[1, 365]])
+    np.testing.assert_allclose(z, [0, 0], atol=1e-9)
+    np.testing.assert_allclose(percentiles(z), [50, 50])
+
+
+def test_one_sd_above_the_median():
+    L, M, S = lms_table("length_for_age")
+    l, m, s = L[0, 200], M[0, 200], S[0, 200]
+    value = m * (1 + l * s) ** (1 / l)
+    np.testing.assert_allclose(zscores("length_for_age", [0], [200], [value]), [1], atol=1e-9)
+
+
+def test_fractional_ages_interpolate():
+    L, M, S = lms_table("weight_for_age")
+    value = (M[1, 30] + M[1, 31]) / 2
+    np.testing.assert_allclose(zscores("weight_for_age", [1], [30.5], [value]), [0], atol=1e-3)
+
+
+def test_unscorable_inputs_give_nan():
+    z = zscores("weight_for_age", [0, 0, 0], [-1, 100000, np.nan], [7, 7, 7])
+    assert np.isnan(z).all()
+    assert np.isnan(percentiles([np.nan])).all()
+
+
+def test_normal_cdf_matches_erf():
+    z = np.linspace(-6, 6, 241)
+    expected = [0.5 * (1 + math.erf(value / math.sqrt(2))) for value in z]
+    np.testing.assert_allclose(normal_cdf(z), expected, atol=1.5e-7)
+
+
+def post_growth(client, child_id, weight, height):
+    response = client.post(f"/children/{child_id}/growth",
+                           json={"growth_date": "2024-07-05", "weight": weight, "height": height})
+    assert response.status_code == 201
+
+
+def test_percentiles_route(client, child_id):
+    post_growth(client, child_id, "7.5", "65")
+    response = client.get(f"/children/{child_id}/growth/percentiles")
+    assert response.status_code == 200
+    [result] = response.json["results"]
+    assert result["age_days"] == 182
+    assert 0 < result["weight_for_age_percentile"] < 100
+    assert result["bmi"] == round(7.5 / 0.65 ** 2, 2)
+
+
+def test_zero_height_is_not_scored(client, child_id):
+    post_growth(client, child_id, "0", "0")
+    response = client.get(f"/children/{child_id}/growth/percentiles")
+    # Strict JSON: no Infinity or NaN tokens
+    json.loads(response.get_data(as_text=True), parse_constant=reject_constant)
+    [result] = response.json["results"]
+    assert result["bmi"] is None
+    assert result["bmi_for_age_z"] is None
+
+
+def reject_constant(token):
+    raise AssertionError(f"{token} in the response")
+
+
+def test_stored_non_finite_measurements(app, client, child_id):
+    # The API rejects them now, but older databases may hold them
+    with app.app_context():
+        db.session.execute(text(
+            "INSERT INTO growth_record (child_id, growth_date, weight, height, version, updated_at) "
+            "VALUES (:child_id, '2024-07-05', 9e999, 65, 1, CURRENT_TIMESTAMP)"
+        ), {"child_id": child_id})
+        db.session.commit()
+    response = client.get(f"/children/{child_id}/growth/percentiles")
+    json.loads(response.get_data(as_text=True), parse_constant=reject_constant)
+    [result] = response.json["results"]
+    assert result["weight"] is None and result["height"] == 65.0
+    for indicator in ("weight_for_age", "bmi_for_age"):
+        assert result[f"{indicator}_z"] is None
+        assert result[f"{indicator}_percentile"] is None
+    assert result["length_for_age_z"] is not None
+
+
+def test_scores_and_percentiles_agree(client, child_id):
+    for weight, height in [("7.5", "65"), ("0", "0"), ("40", "20"), ("0.001", "65")]:
+        post_growth(client, child_id, weight, height)
+    for result in client.get(f"/children/{child_id}/growth/percentiles").json["results"]:
+        for indicator in ("weight_for_age", "length_for_age", "bmi_for_age"):
+            assert (result[f"{indicator}_z"] is None) == (result[f"{indicator}_percentile"] is None)
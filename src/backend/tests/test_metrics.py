@@ -0,0 +1,38 @@
+import re
+
+LIST = 'http_requests_total{endpoint="/children/<int:child_id>/feed",method="GET",status="200"}'
+
+
+def counter(client, line):
+    """Value of one line of /metrics; the counters are process-wide, so tests compare differences"""
+    text = client.get("/metrics").get_data(as_text=True)
+    match = re.search(re.escape(line) + r" (\S+)", text)
+    return float(match.group(1)) if match else 0
+
+
+def test_server_timing(client, child_id):
+    response = client.get(f"/children/{child_id}/feed")
+    timing = response.headers["Server-Timing"]
+    assert re.fullmatch(r'app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"', timing)
+    assert int(re.search(r'"(\d+) queries"', timing).group(1)) >= 1
+
+
+def test_counts_by_route_pattern(client, child_id):
+    before = counter(client, LIST)
+    client.get(f"/children/{child_id}/feed")
+    client.get(f"/children/{child_id + 1}/feed")
+    assert counter(client, LIST) == before + 2
+
+    text = client.get("/metrics").get_data(as_text=True)
+    assert client.get("/metrics").mimetype.startswith("text/plain")
+    assert '# TYPE http_request_duration_seconds histogram' in text
+    assert 'http_request_duration_seconds_bucket{endpoint="/children/<int:child_id>/feed",method="GET",le="+Inf"}' \
+        in text
+    assert 'db_statements_total{endpoint="/children/<int:child_id>/feed",method="GET"}' in text
+
+
+def test_disabled(make_app):
+    client = make_app(METRICS_ENABLED=False).test_client()
+    response = client.get("/children/")
+    assert "Server-Timing" not in response.headers
+    assert client.get("/metrics").status_code == 404
@@ -0,0 +1,87 @@
+import sqlite3
+from app.extensions import db
+from app.migrations import needs_rebuild
+
+# The schema of the first release: every value stored as text, no cascades, no AUTOINCREMENT
+BASELINE_SCHEMA = """
+CREATE TABLE child (id INTEGER PRIMARY KEY, name VARCHAR(20) NOT NULL, sex VARCHAR(20) NOT NULL,
+    date_of_birth VARCHAR(20) NOT NULL);
+CREATE TABLE sleep_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    sleep_date VARCHAR(20) NOT NULL, sleep_type VARCHAR(20) NOT NULL,
+    start_time VARCHAR(20) NOT NULL, end_time VARCHAR(20) NOT NULL);
+CREATE TABLE feeding_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    feed_date VARCHAR(20) NOT NULL, feed_time VARCHAR(20) NOT NULL, feed_type VARCHAR(20) NOT NULL,
+    food_name VARCHAR(20), feed_amount VARCHAR(20));
+CREATE TABLE nappy_change_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    change_date VARCHAR(20) NOT NULL, change_time VARCHAR(20) NOT NULL, change_type VARCHAR(20) NOT NULL);
+CREATE TABLE medication_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    medication_date VARCHAR(20) NOT NULL, medication_type VARCHAR(20) NOT NULL,
+    medication_time VARCHAR(20) NOT NULL, dosage VARCHAR(20) NOT NULL);
+CREATE TABLE temperature_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    date VARCHAR(20) NOT NULL, temperature VARCHAR(10), temperature_time VARCHAR(20));
+CREATE TABLE growth_record (id INTEGER PRIMARY KEY, child_id INTEGER NOT NULL REFERENCES child (id),
+    growth_date VARCHAR(10) NOT NULL, weight VARCHAR(10) NOT NULL, height VARCHAR(10) NOT NULL);
+INSERT INTO child VALUES (1, 'Ada', 'Female', '2024-01-05');
+INSERT INTO sleep_record VALUES (1, 1, '2025-01-01', 'Day time nap', '10:00', '11:30');
+INSERT INTO feeding_record VALUES (1, 1, '2025-01-01', '08:00', 'Solid', 'Apple puree', NULL);
+INSERT INTO feeding_record VALUES (2, 1, '2025-01-01', '12:00', 'Liquid', NULL, '120');
+INSERT INTO temperature_record VALUES (1, 1, '2025-01-01', '', ' 09:00 ');
+INSERT INTO growth_record VALUES (1, 1, '2025-01-01', ' 7.5', '65');
+"""
+
+
+def baseline_app(make_app, tmp_path, *statements):
+    connection = sqlite3.connect(tmp_path / "children.sqlite")
+    connection.executescript(BASELINE_SCHEMA + "".join(statements))
+    connection.close()
+    return make_app(create=False)
+
+
+def test_migrate_baseline_database(make_app, tmp_path):
+    app = baseline_app(make_app, tmp_path)
+    result = app.test_cli_runner().invoke(args=["migrate", "--chunk-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Database migrated!" in result.output
+
+    with app.app_context():
+        assert not any(needs_rebuild(table) for table in db.metadata.sorted_tables)
+
+    client = app.test_client()
+    assert client.get("/children/1/growth").json["results"] == [
+        {"id": 1, "child_id": 1, "growth_date": "2025-01-01", "weight": 7.5, "height": 65.0}
+    ]
+    assert client.get("/children/1/temperature").json["results"] == [
+        {"id": 1, "child_id": 1, "date": "2025-01-01", "temperature": None, "temperature_time": "09:00"}
+    ]
+    # The daily summaries and the search index are built for the existing records
+    report = client.get("/api/children/1/daily-report?date=2025-01-01").json
+    assert report["today_summary"]["feeds_count"] == 2
+    hits = client.get("/children/1/search?q=apple").json["results"]
+    assert [(hit["type"], hit["id"]) for hit in hits] == [("feed", 1)]
+
+
+def test_migrate_twice(make_app, tmp_path):
+    app = baseline_app(make_app, tmp_path)
+    runner = app.test_cli_runner()
+    assert runner.invoke(args=["migrate"]).exit_code == 0
+    result = runner.invoke(args=["migrate"])
+    assert result.exit_code == 0
+    assert "Rebuilt" not in result.output
+    assert len(app.test_client().get("/children/1/feed").json["results"]) == 2
+
+
+def test_ids_stay_taken_after_migrating(make_app, tmp_path):
+    app = baseline_app(make_app, tmp_path)
+    assert app.test_cli_runner().invoke(args=["migrate"]).exit_code == 0
+    client = app.test_client()
+    assert client.delete("/children/1/feed/2").status_code == 200
+    response = client.post("/children/1/feed", json={"feed_date": "2025-01-02", "feed_time": "08:00",
+                                                     "feed_type": "Solid"})
+    assert response.json["id"] == 3
+
+
+def test_unconvertible_value(make_app, tmp_path):
+    app = baseline_app(make_app, tmp_path, "INSERT INTO growth_record VALUES (2, 1, '2025-01-02', 'heavy', '66');")
+    result = app.test_cli_runner().invoke(args=["migrate"])
+    assert result.exit_code != 0
+    assert "growth_record row id=2: cannot convert weight='heavy'" in result.output
@@ -0,0 +1,109 @@
+from datetime import date, time
+import pytest
+from app.records import RECORD_TYPES, decode_cursor, encode_cursor
+
+
+def pages(client, url, limit, **filters):
+    """Every page of a list endpoint, following next_cursor"""
+    results, cursor = [], None
+    while True:
+        params = {**filters, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, query_string=params)
+        assert response.status_code == 200
+        results += response.json["results"]
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            return results
+
+
+def post_bulk(client, child_id, name, records):
+    response = client.post(f"/children/{child_id}/{name}/bulk", json={"records": records})
+    assert response.status_code == 201
+
+
+def test_newest_first(client, child_id):
+    post_bulk(client, child_id, "nappy", [
+        {"change_date": day, "change_time": moment, "change_type": "Wet"}
+        for day, moment in [("2025-01-02", "08:00"), ("2025-01-03", "07:00"), ("2025-01-02", "09:00"),
+                            ("2025-01-02", "08:00")]
+    ])
+    results = client.get(f"/children/{child_id}/nappy").json["results"]
+    assert [(record["change_date"], record["change_time"], record["id"]) for record in results] == [
+        ("2025-01-03", "07:00", 2), ("2025-01-02", "09:00", 3), ("2025-01-02", "08:00", 4), ("2025-01-02", "08:00", 1)
+    ]
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_null_times(client, child_id, limit):
+    times = ["09:00", "", "18:30", "", "07:15", "09:00"]
+    post_bulk(client, child_id, "temperature", [
+        {"date": f"2025-01-0{1 + index % 2}", "temperature": "37", "temperature_time": value}
+        for index, value in enumerate(times)
+    ])
+    url = f"/children/{child_id}/temperature"
+    everything = client.get(url).json["results"]
+    # Records without a time come last within their day
+    assert [(record["date"], record["temperature_time"]) for record in everything] == [
+        ("2025-01-02", "09:00"), ("2025-01-02", None), ("2025-01-02", None),
+        ("2025-01-01", "18:30"), ("2025-01-01", "09:00"), ("2025-01-01", "07:15"),
+    ]
+    assert pages(client, url, limit) == everything
+
+
+@pytest.mark.parametrize("limit", [1, 2, 4])
+def test_times_within_one_minute(client, child_id, limit):
+    # Rows only apart in their seconds must not be skipped between pages
+    post_bulk(client, child_id, "feed", [
+        {"feed_date": "2025-01-01", "feed_time": f"08:00:{second:02d}", "feed_type": "Liquid"}
+        for second in (5, 40, 10, 40, 59)
+    ])
+    url = f"/children/{child_id}/feed"
+    everything = client.get(url).json["results"]
+    assert len(everything) == 5
+    assert pages(client, url, limit) == everything
+
+
+def test_pages_within_a_date_range(client, child_id):
+    post_bulk(client, child_id, "nappy", [
+        {"change_date": f"2025-01-{day:02d}", "change_time": "09:00", "change_type": "Wet"} for day in range(1, 11)
+    ])
+    results = pages(client, f"/children/{child_id}/nappy", 2, **{"from": "2025-01-03", "to": "2025-01-07"})
+    assert [record["change_date"] for record in results] == [f"2025-01-0{day}" for day in range(7, 2, -1)]
+
+
+def test_limit_is_capped(make_app):
+    client = make_app(MAX_PAGE_SIZE=2).test_client()
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    post_bulk(client, 1, "nappy", [
+        {"change_date": "2025-01-01", "change_time": f"0{hour}:00", "change_type": "Wet"} for hour in range(3)
+    ])
+    response = client.get("/children/1/nappy?limit=50").json
+    assert len(response["results"]) == 2
+    assert response["next_cursor"] is not None
+
+
+@pytest.mark.parametrize("query, error", [
+    ("limit=x", "limit must be an integer"),
+    ("limit=0", "limit must be positive"),
+    ("cursor=zz", "Invalid cursor"),
+    ("from=2025-13-01", "from must be a date in YYYY-MM-DD format"),
+])
+def test_bad_arguments(client, child_id, query, error):
+    response = client.get(f"/children/{child_id}/feed?{query}")
+    assert response.status_code == 400
+    assert response.json == {"error": error}
+
+
+@pytest.mark.parametrize("values", [
+    [date(2025, 1, 1), time(8, 0, 40), 7],
+    [date(2025, 1, 1), time(8, 0, 40, 250000), 8],
+    [date(2025, 1, 1), None, 9],
+])
+def test_cursor_round_trip(values):
+    columns = RECORD_TYPES["temperature"].order_columns()
+    assert decode_cursor(encode_cursor(values), columns) == values
+
+
+def test_cursor_of_the_wrong_shape():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(encode_cursor([date(2025, 1, 1), 7]), RECORD_TYPES["feed"].order_columns())
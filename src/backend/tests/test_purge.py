@@ -0,0 +1,58 @@
+from sqlalchemy import func, select, text
+from app.extensions import db
+from app.models import DailySummary, FeedingRecord, SleepRecord, Tombstone
+from app.search import TABLE
+
+FEED = {"type": "feed", "feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Solid",
+        "food_name": "Apple puree"}
+SLEEP = {"type": "sleep", "sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00",
+         "end_time": "11:30"}
+
+
+def add_child(client, name):
+    client.post("/children/", json={"name": name, "sex": "Female", "date_of_birth": "2024-01-05"})
+    child_id = client.get("/children/").json["results"][-1]["id"]
+    ids = [result["id"] for result in
+           client.post(f"/children/{child_id}/bulk", json={"records": [FEED, FEED, SLEEP]}).json["results"]]
+    # A delete leaves a tombstone for delta sync
+    client.delete(f"/children/{child_id}/feed/{ids[0]}")
+    return child_id
+
+
+def rows_of(app, child_id):
+    """How many rows each table holds for a child"""
+    with app.app_context():
+        counts = {
+            model.__tablename__: db.session.scalar(
+                select(func.count()).select_from(model).where(model.child_id == child_id)
+            )
+            for model in (FeedingRecord, SleepRecord, DailySummary, Tombstone)
+        }
+        counts[TABLE] = db.session.scalar(
+            text(f"SELECT count(*) FROM {TABLE} WHERE {TABLE} MATCH :match"), {"match": f'child_id : "{child_id}"'}
+        )
+        return counts
+
+
+def test_delete_child_cascades(app, client):
+    kept, purged = add_child(client, "Ada"), add_child(client, "Bo")
+    before = rows_of(app, kept)
+    assert rows_of(app, purged) == before == {
+        "feeding_record": 1, "sleep_record": 1, "daily_summary": 1, "record_tombstone": 1, TABLE: 1
+    }
+
+    assert client.delete(f"/children/{purged}").status_code == 200
+    assert set(rows_of(app, purged).values()) == {0}
+    assert rows_of(app, kept) == before
+    assert client.get(f"/children/{purged}").status_code == 404
+    assert client.delete(f"/children/{purged}").status_code == 404
+
+
+def test_purge_command(app, client):
+    first, second, third = (add_child(client, name) for name in ("Ada", "Bo", "Cy"))
+    result = app.test_cli_runner().invoke(args=["purge", str(first), str(third), "99"])
+    assert result.exit_code == 0, result.output
+    assert "Deleted 2 children" in result.output
+    assert "Not found: 99" in result.output
+    assert set(rows_of(app, first).values()) == set(rows_of(app, third).values()) == {0}
+    assert rows_of(app, second)["feeding_record"] == 1
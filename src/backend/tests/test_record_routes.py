@@ -0,0 +1,63 @@
+import pytest
+from app.records import RECORD_TYPES
+
+SAMPLES = {
+    "sleep": {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"},
+    "feed": {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid", "feed_amount": "120"},
+    "nappy": {"change_date": "2025-01-01", "change_time": "09:00", "change_type": "Wet"},
+    "medication": {"medication_date": "2025-01-01", "medication_time": "09:00",
+                   "medication_type": "Paracetamol", "dosage": "2.5ml"},
+    "temperature": {"date": "2025-01-01", "temperature": "37.1", "temperature_time": "09:00"},
+    "growth": {"growth_date": "2025-01-01", "weight": "7.5", "height": "65"},
+}
+
+EXPECTED = {
+    "sleep": {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"},
+    "feed": {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid", "feed_amount": "120",
+             "food_name": None},
+    "nappy": {"change_date": "2025-01-01", "change_time": "09:00", "change_type": "Wet"},
+    "medication": {"medication_date": "2025-01-01", "medication_time": "09:00",
+                   "medication_type": "Paracetamol", "dosage": "2.5ml"},
+    "temperature": {"date": "2025-01-01", "temperature": 37.1, "temperature_time": "09:00"},
+    "growth": {"growth_date": "2025-01-01", "weight": 7.5, "height": 65.0},
+}
+
+
+def test_every_record_type_has_a_sample():
+    assert set(SAMPLES) == set(RECORD_TYPES)
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_create_list_delete(client, child_id, name):
+    created = client.post(f"/children/{child_id}/{name}", json=SAMPLES[name])
+    assert created.status_code == 201
+    record_id = created.json["id"]
+
+    listed = client.get(f"/children/{child_id}/{name}").json
+    assert listed["results"] == [{"id": record_id, "child_id": child_id, **EXPECTED[name]}]
+    assert listed["next_cursor"] is None
+
+    assert client.delete(f"/children/{child_id}/{name}/{record_id}").status_code == 200
+    assert client.get(f"/children/{child_id}/{name}").json["results"] == []
+    assert client.delete(f"/children/{child_id}/{name}/{record_id}").status_code == 404
+
+
+@pytest.mark.parametrize("name", list(SAMPLES))
+def test_missing_field(client, child_id, name):
+    record = dict(SAMPLES[name])
+    record.pop(RECORD_TYPES[name].required[0])
+    response = client.post(f"/children/{child_id}/{name}", json=record)
+    assert response.status_code == 400
+    assert response.json == {"error": "Missing required fields"}
+
+
+def test_unknown_child(client):
+    assert client.post("/children/99/feed", json=SAMPLES["feed"]).status_code == 404
+
+
+def test_records_belong_to_their_child(client, child_id):
+    client.post("/children/", json={"name": "Bo", "sex": "Male", "date_of_birth": "2024-03-01"})
+    record_id = client.post(f"/children/{child_id}/feed", json=SAMPLES["feed"]).json["id"]
+    assert client.get(f"/children/{child_id + 1}/feed").json["results"] == []
+    assert client.delete(f"/children/{child_id + 1}/feed/{record_id}").status_code == 404
+    assert len(client.get(f"/children/{child_id}/feed").json["results"]) == 1
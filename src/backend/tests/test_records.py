@@ -0,0 +1,36 @@
+SLEEP = {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"}
+GROWTH = {"growth_date": "2025-01-01", "weight": "7.5", "height": "65"}
+
+
+def test_every_type_in_one_response(client, child_id):
+    client.post(f"/children/{child_id}/sleep", json=SLEEP)
+    client.post(f"/children/{child_id}/growth", json=GROWTH)
+    response = client.get(f"/children/{child_id}/records")
+    assert response.status_code == 200
+    results = response.json["results"]
+    assert set(results) == {"sleep", "feed", "nappy", "medication", "temperature", "growth"}
+    assert [record["sleep_type"] for record in results["sleep"]] == ["Day time nap"]
+    assert [record["weight"] for record in results["growth"]] == [7.5]
+    assert results["feed"] == []
+
+
+def test_selected_types_and_dates(client, child_id):
+    for day in ["2025-01-01", "2025-01-02", "2025-01-03"]:
+        client.post(f"/children/{child_id}/sleep", json={**SLEEP, "sleep_date": day})
+        client.post(f"/children/{child_id}/growth", json={**GROWTH, "growth_date": day})
+    results = client.get(f"/children/{child_id}/records?types=sleep&from=2025-01-02").json["results"]
+    assert list(results) == ["sleep"]
+    assert [record["sleep_date"] for record in results["sleep"]] == ["2025-01-02", "2025-01-03"]
+
+
+def test_oldest_first(client, child_id):
+    for day in ["2025-01-03", "2025-01-01", "2025-01-02"]:
+        client.post(f"/children/{child_id}/sleep", json={**SLEEP, "sleep_date": day})
+    results = client.get(f"/children/{child_id}/records?types=sleep").json["results"]
+    assert [record["sleep_date"] for record in results["sleep"]] == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+
+def test_bad_arguments(client, child_id):
+    response = client.get(f"/children/{child_id}/records?types=sleep,x")
+    assert (response.status_code, response.json) == (400, {"error": "Unknown record types: x"})
+    assert client.get(f"/children/{child_id}/records?from=yesterday").status_code == 400
@@ -0,0 +1,53 @@
+import pytest
+from app.extensions import report_cache
+
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+URL = "/api/children/{}/daily-report?date=2025-01-01"
+
+
+def feeds_count(response):
+    return response.json["today_summary"]["feeds_count"]
+
+
+def test_etag_and_304(client, child_id):
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    first = client.get(URL.format(child_id))
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    etag = first.headers["ETag"]
+
+    again = client.get(URL.format(child_id), headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert client.get("/api/report-cache").json["results"]["hits"] == 1
+
+
+@pytest.mark.parametrize("write", ["single", "bulk", "delete"])
+def test_writes_make_the_report_stale(client, child_id, write):
+    record_id = client.post(f"/children/{child_id}/feed", json=FEED).json["id"]
+    etag = client.get(URL.format(child_id)).headers["ETag"]
+    if write == "single":
+        client.post(f"/children/{child_id}/feed", json=FEED)
+    elif write == "bulk":
+        client.post(f"/children/{child_id}/bulk", json={"records": [{"type": "feed", **FEED}]})
+    else:
+        client.delete(f"/children/{child_id}/feed/{record_id}")
+
+    response = client.get(URL.format(child_id), headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert feeds_count(response) == (0 if write == "delete" else 2)
+
+
+def test_write_by_another_worker(app, client, child_id, make_app, monkeypatch):
+    # A second app on the same database stands in for another worker process, whose
+    # commits can't evict this worker's cache entries
+    other = make_app(create=False).test_client()
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    assert feeds_count(client.get(URL.format(child_id))) == 1
+
+    monkeypatch.setattr(report_cache, "invalidate_child", lambda child_id: None)
+    assert other.post(f"/children/{child_id}/feed", json=FEED).status_code == 201
+
+    assert feeds_count(client.get(URL.format(child_id))) == 2
+
@@ -0,0 +1,61 @@
+import json
+from app.extensions import db
+from app.models import GeneratedReport
+
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+def add_children(client, count):
+    for number in range(count):
+        client.post("/children/", json={"name": f"Child {number}", "sex": "Female", "date_of_birth": "2024-01-05"})
+    ids = [child["id"] for child in client.get("/children/").json["results"]]
+    client.post(f"/children/{ids[0]}/feed", json=FEED)
+    return ids
+
+
+def api_reports(client, ids):
+    return {
+        child_id: client.get(f"/api/children/{child_id}/daily-report?date=2025-01-01").json
+        for child_id in ids
+    }
+
+
+def generate(app, *args):
+    result = app.test_cli_runner().invoke(args=["reports", "generate", "--date", "2025-01-01", *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def stored_reports(app):
+    with app.app_context():
+        return {row.child_id: json.loads(row.body) for row in db.session.scalars(db.select(GeneratedReport))}
+
+
+def test_generate_into_table(app, client):
+    ids = add_children(client, 3)
+    output = generate(app, "--workers", "1", "--shard-size", "2")
+    assert "Generated 3 reports" in output
+    assert stored_reports(app) == api_reports(client, ids)
+
+    # Running again replaces the stored reports instead of failing on the existing rows
+    client.post(f"/children/{ids[1]}/feed", json=FEED)
+    generate(app, "--workers", "1")
+    assert stored_reports(app) == api_reports(client, ids)
+
+
+def test_generate_ndjson_shards(app, client, tmp_path):
+    ids = add_children(client, 3)
+    directory = tmp_path / "reports"
+    generate(app, "--workers", "1", "--shard-size", "2", "--output", "ndjson", "--directory", str(directory))
+    assert sorted(path.name for path in directory.iterdir()) == [
+        "reports-2025-01-01-0000.ndjson", "reports-2025-01-01-0001.ndjson"
+    ]
+    lines = [line for path in sorted(directory.iterdir()) for line in path.read_text().splitlines()]
+    assert [json.loads(line) for line in lines] == list(api_reports(client, ids).values())
+
+
+def test_generate_over_a_process_pool(app, client):
+    ids = add_children(client, 3)
+    # Pool processes build their apps from this app's config, so they write to the same database
+    generate(app, "--workers", "2", "--shard-size", "1")
+    assert stored_reports(app) == api_reports(client, ids)
@@ -0,0 +1,76 @@
+import shutil
+import time
+import pytest
+from flask import g
+from sqlalchemy import select, text, union_all
+from app.extensions import db
+from app.models import FeedingRecord
+from app.routing import LAST_WRITE_HEADER, REPLICA
+
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    return make_app(READ_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.sqlite'}")
+
+
+@pytest.fixture
+def lagging(app, client, tmp_path):
+    """A child on the primary, and a replica that stopped copying right after it was added"""
+    client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    shutil.copy(tmp_path / "children.sqlite", tmp_path / "replica.sqlite")
+    return 1
+
+
+def feed_ids(client, child_id, **headers):
+    return [record["id"] for record in client.get(f"/children/{child_id}/feed", headers=headers).json["results"]]
+
+
+def test_reads_go_to_the_replica(client, lagging):
+    response = client.post(f"/children/{lagging}/feed", json=FEED)
+    assert response.status_code == 201
+    # Without the write time the read comes from the replica, which hasn't seen the record
+    assert feed_ids(client, lagging) == []
+    assert client.get(f"/children/{lagging}").status_code == 200
+
+
+def test_read_your_writes(client, lagging):
+    response = client.post(f"/children/{lagging}/feed", json=FEED)
+    written = response.headers[LAST_WRITE_HEADER]
+    assert feed_ids(client, lagging, **{LAST_WRITE_HEADER: written}) == [response.json["id"]]
+
+    # Past the window the client reads from the replica again
+    expired = f"{float(written) - 60:.3f}"
+    assert feed_ids(client, lagging, **{LAST_WRITE_HEADER: expired}) == []
+    assert feed_ids(client, lagging, **{LAST_WRITE_HEADER: "soon"}) == []
+
+
+def test_no_write_time_without_a_window(make_app, tmp_path):
+    client = make_app(READ_REPLICA_URL=f"sqlite:///{tmp_path / 'replica.sqlite'}",
+                      READ_YOUR_WRITES_SECONDS=0).test_client()
+    response = client.post("/children/", json={"name": "Ada", "sex": "Female", "date_of_birth": "2024-01-05"})
+    assert response.status_code == 200
+    assert LAST_WRITE_HEADER not in response.headers
+
+
+def test_write_time_exposed_to_other_origins(client, lagging):
+    response = client.post(f"/children/{lagging}/feed", json=FEED, headers={"Origin": "http://localhost:5173"})
+    assert LAST_WRITE_HEADER in response.headers["Access-Control-Expose-Headers"]
+    assert abs(float(response.headers[LAST_WRITE_HEADER]) - time.time()) < 60
+
+
+def test_statements_routed_to_the_replica(app):
+    query = select(FeedingRecord.id)
+    with app.test_request_context():
+        g.read_replica = True
+        replica, primary = db.engines[REPLICA], db.engine
+        assert db.session.get_bind(clause=query) is replica
+        # The archive unions and the search queries are reads too
+        assert db.session.get_bind(clause=union_all(query, query)) is replica
+        assert db.session.get_bind(clause=text("SELECT 1 AS one").columns(one=db.Integer)) is replica
+        # Raw SQL without declared columns may write, so it stays on the primary
+        assert db.session.get_bind(clause=text("DELETE FROM feeding_record")) is primary
+
+        g.read_replica = False
+        assert db.session.get_bind(clause=query) is primary
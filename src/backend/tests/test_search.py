@@ -0,0 +1,34 @@
+def post_feed(client, child_id, food_name):
+    response = client.post(f"/children/{child_id}/feed", json={"feed_date": "2025-01-01", "feed_time": "08:00",
+                                                               "feed_type": "Solid", "food_name": food_name})
+    return response.json["id"]
+
+
+def test_search_stays_within_the_child(client, child_id):
+    client.post("/children/", json={"name": "Bo", "sex": "Male", "date_of_birth": "2024-03-01"})
+    other = child_id + 1
+    mine = post_feed(client, child_id, "Apple purée")
+    post_feed(client, other, "Apple puree")
+    post_feed(client, child_id, "Banana")
+
+    hits = client.get(f"/children/{child_id}/search?q=APP pur").json["results"]
+    assert [(hit["type"], hit["id"]) for hit in hits] == [("feed", mine)]
+    assert client.get(f"/children/{other}/search?q=banana").json["results"] == []
+
+
+def test_suggestions_most_used_first(client, child_id):
+    for food_name in ["Pear", "Peas", "Peas", "Apple"]:
+        post_feed(client, child_id, food_name)
+    response = client.get(f"/children/{child_id}/search/suggestions?type=feed&q=pe")
+    assert response.json["results"] == ["Peas", "Pear"]
+
+
+def test_deleted_records_leave_the_index(client, child_id):
+    record_id = post_feed(client, child_id, "Apple")
+    client.delete(f"/children/{child_id}/feed/{record_id}")
+    assert client.get(f"/children/{child_id}/search?q=apple").json["results"] == []
+
+
+def test_bad_query(client, child_id):
+    assert client.get(f"/children/{child_id}/search?q=%20").status_code == 400
+    assert client.get(f"/children/{child_id}/search/suggestions?type=sleep&q=a").status_code == 400
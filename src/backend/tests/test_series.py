@@ -0,0 +1,68 @@
+import math
+import pytest
+from app.series import lttb
+
+
+def test_lttb_keeps_everything_below_the_threshold():
+    assert lttb([0, 1, 2], [5, 6, 7], 10) == [0, 1, 2]
+    assert lttb(list(range(5)), [0] * 5, 2) == list(range(5))
+
+
+def test_lttb_keeps_the_ends_and_the_peaks():
+    xs = list(range(100))
+    ys = [0.0] * 100
+    ys[23], ys[71] = 50.0, -40.0
+    kept = lttb(xs, ys, 10)
+    assert len(kept) == 10
+    assert kept == sorted(set(kept))
+    assert kept[0] == 0 and kept[-1] == 99
+    assert {23, 71} <= set(kept)
+
+
+def test_lttb_follows_a_curve():
+    xs = [index / 10 for index in range(1000)]
+    ys = [math.sin(x) for x in xs]
+    kept = lttb(xs, ys, 50)
+    assert len(kept) == 50
+    assert max(ys[index] for index in kept) > 0.99
+    assert min(ys[index] for index in kept) < -0.99
+
+
+@pytest.fixture
+def temperatures(client, child_id):
+    records = [
+        {"date": "2025-01-01", "temperature": "37.0", "temperature_time": "09:00"},
+        {"date": "2025-01-01", "temperature": "38.0", "temperature_time": ""},
+        {"date": "2025-01-02", "temperature": "37.5", "temperature_time": "21:15"},
+    ]
+    assert client.post(f"/children/{child_id}/temperature/bulk", json={"records": records}).status_code == 201
+
+
+@pytest.mark.parametrize("bucket", ["raw", "day", "hour"])
+def test_null_times_in_every_bucket(client, child_id, temperatures, bucket):
+    response = client.get(f"/children/{child_id}/series/temperature?bucket={bucket}")
+    assert response.status_code == 200
+    results = response.json["results"]
+    assert results["bucket"] == bucket
+    assert len(results["x"]) == results["total_points"]
+    assert all(len(values) == len(results["x"]) for values in results["series"].values())
+
+
+def test_hour_buckets_leave_out_records_without_a_time(client, child_id, temperatures):
+    results = client.get(f"/children/{child_id}/series/temperature?bucket=hour").json["results"]
+    assert results["total_points"] == 2
+
+
+def test_points_downsample(client, child_id):
+    records = [{"feed_date": f"2025-01-{day:02d}", "feed_time": "08:00", "feed_type": "Liquid"}
+               for day in range(1, 29)]
+    client.post(f"/children/{child_id}/feed/bulk", json={"records": records})
+    results = client.get(f"/children/{child_id}/series/feed?bucket=day&points=5").json["results"]
+    assert results["total_points"] == 28
+    assert len(results["x"]) == 5
+    assert results["x"][0] == "2025-01-01" and results["x"][-1] == "2025-01-28"
+
+
+@pytest.mark.parametrize("query, status", [("metric", 404), ("feed?bucket=minute", 400), ("feed?points=2", 400)])
+def test_bad_arguments(client, child_id, query, status):
+    assert client.get(f"/children/{child_id}/series/{query}").status_code == status
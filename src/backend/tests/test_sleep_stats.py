@@ -0,0 +1,48 @@
+import pytest
+
+SLEEPS = [
+    {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"},
+    {"sleep_date": "2025-01-01", "sleep_type": "Night time sleep", "start_time": "19:00", "end_time": "06:30"},
+    {"sleep_date": "2025-01-09", "sleep_type": "Day time nap", "start_time": "13:00", "end_time": "14:15"},
+    {"sleep_date": "2025-02-03", "sleep_type": "Night time sleep", "start_time": "20:00", "end_time": "07:00"},
+]
+
+
+@pytest.fixture
+def sleeps(client, child_id):
+    client.post(f"/children/{child_id}/sleep/bulk", json={"records": SLEEPS})
+
+
+def stats(client, child_id, query):
+    response = client.get(f"/api/children/{child_id}/sleep-stats?{query}")
+    assert response.status_code == 200
+    return response.json["results"]
+
+
+def test_totals(client, child_id, sleeps):
+    results = stats(client, child_id, "from=2024-12-20&to=2025-01-31")
+    assert results["totals"] == {"total_sleep_minutes": 855, "days_with_records": 2,
+                                 "avg_sleep_hours": 7.1, "avg_naps_per_day": 1.0}
+    assert "buckets" not in results
+
+
+@pytest.mark.parametrize("bucket, expected", [
+    ("day", [("2025-01-01", 780), ("2025-01-09", 75), ("2025-02-03", 660)]),
+    ("week", [("2024-12-30", 780), ("2025-01-06", 75), ("2025-02-03", 660)]),
+    ("month", [("2025-01-01", 855), ("2025-02-01", 660)]),
+])
+def test_buckets(client, child_id, sleeps, bucket, expected):
+    results = stats(client, child_id, f"from=2024-12-20&to=2025-02-28&bucket={bucket}")
+    assert [(row["bucket"], row["total_sleep_minutes"]) for row in results["buckets"]] == expected
+    assert results["totals"]["total_sleep_minutes"] == 1515
+
+
+def test_empty_window(client, child_id, sleeps):
+    totals = stats(client, child_id, "from=2023-01-01&to=2023-01-31")["totals"]
+    assert totals["total_sleep_minutes"] == 0
+    assert totals["days_with_records"] == 0
+
+
+@pytest.mark.parametrize("query", ["bucket=hour", "from=yesterday"])
+def test_bad_arguments(client, child_id, query):
+    assert client.get(f"/api/children/{child_id}/sleep-stats?{query}").status_code == 400
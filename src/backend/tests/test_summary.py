@@ -0,0 +1,62 @@
+from datetime import date, time
+from sqlalchemy import select
+from app.extensions import db
+from app.models import DailySummary
+from app.summary import COUNTERS, calculate_duration_minutes, rebuild_summaries
+
+NAP = {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "10:00", "end_time": "11:30"}
+NIGHT = {"sleep_date": "2025-01-01", "sleep_type": "Night time sleep", "start_time": "19:00", "end_time": "06:30"}
+FEED = {"feed_date": "2025-01-01", "feed_time": "08:00", "feed_type": "Liquid"}
+
+
+def summaries(app, child_id):
+    """{date: {counter: value}} as stored in daily_summary"""
+    with app.app_context():
+        rows = db.session.scalars(select(DailySummary).where(DailySummary.child_id == child_id)).all()
+        return {row.date: {key: getattr(row, key) for key in COUNTERS} for row in rows}
+
+
+def test_duration_across_midnight():
+    assert calculate_duration_minutes(time(10, 0), time(11, 30)) == 90
+    assert calculate_duration_minutes(time(19, 0), time(6, 30)) == 690
+
+
+def test_creates_and_deletes_keep_the_summary(app, client, child_id):
+    client.post(f"/children/{child_id}/sleep", json=NAP)
+    night = client.post(f"/children/{child_id}/sleep", json=NIGHT).json["id"]
+    client.post(f"/children/{child_id}/feed/bulk", json={"records": [FEED, FEED, {**FEED, "feed_date": "2025-01-02"}]})
+    client.post(f"/children/{child_id}/bulk", json={"records": [
+        {"type": "nappy", "change_date": "2025-01-01", "change_time": "09:00", "change_type": "Wet"},
+        {"type": "growth", "growth_date": "2025-01-01", "weight": "7.5", "height": "65"},
+    ]})
+    day = summaries(app, child_id)[date(2025, 1, 1)]
+    assert day == {"sleep_count": 2, "naps_count": 1, "sleep_minutes": 780, "feeds_count": 2,
+                   "nappy_changes": 1, "medication_count": 0, "temperature_count": 0}
+    assert summaries(app, child_id)[date(2025, 1, 2)]["feeds_count"] == 1
+
+    client.delete(f"/children/{child_id}/sleep/{night}")
+    day = summaries(app, child_id)[date(2025, 1, 1)]
+    assert (day["sleep_count"], day["naps_count"], day["sleep_minutes"]) == (1, 1, 90)
+
+
+def test_matches_a_rebuild(app, client, child_id):
+    client.post(f"/children/{child_id}/sleep", json=NAP)
+    client.post(f"/children/{child_id}/sleep", json=NIGHT)
+    ids = [result["id"] for result in client.post(
+        f"/children/{child_id}/feed/bulk", json={"records": [FEED] * 3}).json["results"]]
+    client.delete(f"/children/{child_id}/feed/{ids[1]}")
+    client.post(f"/children/{child_id}/temperature",
+                json={"date": "2025-01-03", "temperature": "37", "temperature_time": ""})
+    maintained = summaries(app, child_id)
+    with app.app_context():
+        rebuild_summaries(echo=lambda message: None)
+    assert summaries(app, child_id) == maintained
+
+
+def test_daily_report_reads_the_summary(client, child_id):
+    client.post(f"/children/{child_id}/sleep", json=NAP)
+    client.post(f"/children/{child_id}/feed", json=FEED)
+    report = client.get(f"/api/children/{child_id}/daily-report?date=2025-01-01").json
+    assert report["today_summary"]["feeds_count"] == 1
+    assert report["today_summary"]["naps_count"] == 1
+    assert report["today_summary"]["sleep_hours"] == 1.5
@@ -0,0 +1,60 @@
+from datetime import date, time
+import pytest
+from app.models import GrowthRecord, TemperatureRecord
+from app.serialization import parse_value
+
+GROWTH = {"growth_date": "2025-01-01", "weight": "7.5", "height": "65"}
+TEMPERATURE = {"date": "2025-01-01", "temperature": "37.1", "temperature_time": "09:00"}
+
+
+@pytest.mark.parametrize("column, value, expected", [
+    (GrowthRecord.growth_date, "2025-01-31", date(2025, 1, 31)),
+    (TemperatureRecord.temperature_time, "09:05", time(9, 5)),
+    (TemperatureRecord.temperature_time, "09:05:30", time(9, 5, 30)),
+    (GrowthRecord.weight, " 7.5", 7.5),
+    (GrowthRecord.weight, 8, 8.0),
+    (TemperatureRecord.temperature, "", None),
+])
+def test_parse_value(column, value, expected):
+    assert parse_value(column, value) == expected
+
+
+@pytest.mark.parametrize("column, value", [
+    (GrowthRecord.growth_date, "31/01/2025"),
+    (TemperatureRecord.temperature_time, "9am"),
+    (GrowthRecord.weight, True),
+    (GrowthRecord.weight, "heavy"),
+    (GrowthRecord.weight, "inf"),
+    (GrowthRecord.weight, "-1e999"),
+    (GrowthRecord.weight, "nan"),
+])
+def test_parse_value_rejects(column, value):
+    with pytest.raises(ValueError):
+        parse_value(column, value)
+
+
+@pytest.mark.parametrize("name, record, field", [
+    ("sleep", {"sleep_date": "2025-01-01", "sleep_type": "Day time nap", "start_time": "", "end_time": "11:30"},
+     "start_time"),
+    ("growth", {**GROWTH, "weight": ""}, "weight"),
+    ("growth", {**GROWTH, "weight": "nan"}, "weight"),
+    ("temperature", {**TEMPERATURE, "temperature": "inf"}, "temperature"),
+    ("temperature", {**TEMPERATURE, "date": "tomorrow"}, "date"),
+])
+def test_invalid_values(client, child_id, name, record, field):
+    response = client.post(f"/children/{child_id}/{name}", json=record)
+    assert response.status_code == 400
+    assert response.json == {"error": f"Invalid value for {field}"}
+    assert client.get(f"/children/{child_id}/{name}").json["results"] == []
+
+
+def test_empty_value_of_nullable_column(client, child_id):
+    response = client.post(f"/children/{child_id}/temperature", json={**TEMPERATURE, "temperature": ""})
+    assert response.status_code == 201
+    assert client.get(f"/children/{child_id}/temperature").json["results"][0]["temperature"] is None
+
+
+def test_values_come_back_in_the_wire_format(client, child_id):
+    client.post(f"/children/{child_id}/temperature", json={**TEMPERATURE, "temperature_time": "09:05:30"})
+    [record] = client.get(f"/children/{child_id}/temperature").json["results"]
+    assert (record["date"], record["temperature"], record["temperature_time"]) == ("2025-01-01", 37.1, "09:05")
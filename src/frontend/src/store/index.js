@@ -3,6 +3,25 @@ import dayjs from 'dayjs'
 import axios from 'axios'
 import { ElMessage, ElLoading } from 'element-plus'
 
+// Time of this tab's last write, as stamped by the backend. Sending it back keeps the
+// following reads on the primary database while a read replica may still lag behind.
+let lastWrite = null
+
+axios.interceptors.response.use(res => {
+  const written = res.headers['x-last-write']
+  if (written) {
+    lastWrite = written
+  }
+  return res
+})
+
+axios.interceptors.request.use(config => {
+  if (lastWrite) {
+    config.headers['X-Last-Write'] = lastWrite
+  }
+  return config
+})
+
 // Children data store - holds list of all children
 export const children = ref([])
 
@@ -196,14 +215,18 @@ export const fetchAllRecordsForCurrentChild = async () => {
       background: 'rgba(255, 255, 255, 0.7)'
     })
     
-    await Promise.all([
-      fetchSleepRecords(currentChildId.value),
-      fetchFeedRecords(currentChildId.value),
-      fetchChangeNappyRecords(currentChildId.value),
-      fetchMedicationRecords(currentChildId.value),
-      fetchGrowthRecords(currentChildId.value),
-      fetchTemperatureRecords(currentChildId.value)
-    ])
+    // One request returns every record type for the child
+    const res = await axios.get(`http://127.0.0.1:5000/children/${currentChildId.value}/records`)
+    const results = res.data.results
+    sleepRecords.value = results.sleep
+    feedRecords.value = results.feed
+    changeNappyRecords.value = results.nappy
+    medicationRecords.value = results.medication
+    growthRecords.value = results.growth
+    temperatureRecords.value = results.temperature
+    syncState.childId = currentChildId.value
+    syncState.version = res.data.version
+    subscribeToCurrentChild()
     
     loading.close()
   } catch (error) {
@@ -213,73 +236,80 @@ export const fetchAllRecordsForCurrentChild = async () => {
   }
 }
 
-// Individual record fetch functions
-export const fetchSleepRecords = async (childID) => {
-  try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/sleep`)
-    sleepRecords.value = res.data.results
-    return res.data.results
-  } catch (error) {
-    console.error('Failed to fetch sleep records:', error)
-    throw error
-  }
+// Record collections by the type names the API uses
+const recordCollections = {
+  sleep: sleepRecords,
+  feed: feedRecords,
+  nappy: changeNappyRecords,
+  medication: medicationRecords,
+  growth: growthRecords,
+  temperature: temperatureRecords
 }
 
-export const fetchFeedRecords = async (childID) => {
-  try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/feed`)
-    feedRecords.value = res.data.results
-    return res.data.results
-  } catch (error) {
-    console.error('Failed to fetch feed records:', error)
-    throw error
-  }
-}
+// Sync token of the last full load; later refreshes only fetch what changed since
+const syncState = { childId: null, version: null }
 
-export const fetchChangeNappyRecords = async (childID) => {
-  try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/nappy`)
-    changeNappyRecords.value = res.data.results
-    return res.data.results
-  } catch (error) {
-    console.error('Failed to fetch nappy records:', error)
-    throw error
+// Apply the records created or deleted since the last sync, falling back to a full load
+export const syncRecordsForCurrentChild = async () => {
+  if (!currentChildId.value) return
+  if (syncState.childId !== currentChildId.value || syncState.version === null) {
+    return fetchAllRecordsForCurrentChild()
   }
+
+  const res = await axios.get(`http://127.0.0.1:5000/children/${currentChildId.value}/changes`, {
+    params: { since: syncState.version }
+  })
+  applyChanges(res.data.results)
 }
 
-export const fetchMedicationRecords = async (childID) => {
-  try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/medication`)
-    medicationRecords.value = res.data.results
-    return res.data.results
-  } catch (error) {
-    console.error('Failed to fetch medication records:', error)
-    throw error
-  }
+// Merge a /changes result (or an /events payload, which only lists the types it touches)
+const applyChanges = ({ version, changed, deleted }) => {
+  Object.entries(recordCollections).forEach(([type, collection]) => {
+    const created = changed[type] || []
+    const replaced = new Set([...(deleted[type] || []), ...created.map(record => record.id)])
+    if (!replaced.size) return
+    collection.value = [...collection.value.filter(record => !replaced.has(record.id)), ...created]
+  })
+  syncState.version = Math.max(syncState.version, version)
 }
 
-export const fetchGrowthRecords = async (childID) => {
-  try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/growth`)
-    growthRecords.value = res.data.results
-    return res.data.results
-  } catch (error) {
-    console.error('Failed to fetch growth records:', error)
-    throw error
-  }
+// Live updates from other caregivers; the browser resumes from the last event id on reconnect
+let eventSource = null
+
+const subscribeToCurrentChild = () => {
+  if (eventSource) eventSource.close()
+  const childId = syncState.childId
+  eventSource = new EventSource(
+    `http://127.0.0.1:5000/children/${childId}/events?since=${syncState.version}`
+  )
+  eventSource.addEventListener('changes', (event) => {
+    if (syncState.childId === childId) applyChanges(JSON.parse(event.data))
+  })
 }
 
-export const fetchTemperatureRecords = async (childID) => {
+// Individual record fetch functions; for the current child they only fetch the changes
+const fetchRecordsOfType = (type, label) => async (childID) => {
   try {
-    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/temperature`)
-    temperatureRecords.value = res.data.results
+    if (childID === currentChildId.value && syncState.childId === childID) {
+      await syncRecordsForCurrentChild()
+      return recordCollections[type].value
+    }
+    const res = await axios.get(`http://127.0.0.1:5000/children/${childID}/${type}`)
+    recordCollections[type].value = res.data.results
     return res.data.results
   } catch (error) {
-    console.error('Failed to fetch temperature records:', error)
+    console.error(`Failed to fetch ${label} records:`, error)
     throw error
   }
 }
 
+export const fetchSleepRecords = fetchRecordsOfType('sleep', 'sleep')
+export const fetchFeedRecords = fetchRecordsOfType('feed', 'feed')
+export const fetchChangeNappyRecords = fetchRecordsOfType('nappy', 'nappy')
+export const fetchMedicationRecords = fetchRecordsOfType('medication', 'medication')
+export const fetchGrowthRecords = fetchRecordsOfType('growth', 'growth')
+export const fetchTemperatureRecords = fetchRecordsOfType('temperature', 'temperature')
+
 // Utility functions
 export const calculateAge = (dob) => {
   if (!dob) return ''